@@ -1,5 +1,7 @@
 import numpy as np
 
+from barrel.geometry import segment_area
+
 # ====================================================
 # Geometry (FIXED)
 # ====================================================
@@ -53,8 +55,7 @@ def mc_surface_area(b, m):
     
     # Top segment area (numerical, average of circular segments)
     y_top = np.clip(b - m * x_in, -R, R)
-    theta = np.arccos(-y_top/R)
-    top_area = np.mean(R**2 * theta - y_top * np.sqrt(R**2 - y_top**2))
+    top_area = np.mean(segment_area(y_top, R))
     
     return lateral + top_area
 
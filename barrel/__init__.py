@@ -0,0 +1,51 @@
+"""
+Inclined barrel geometry, solvers and animation tooling.
+
+Importing the package is free: submodules and the names below load on
+first attribute access (PEP 562). The core (geometry, surrogate, fleet,
+memo, stream) needs NumPy only; reference and the Monte Carlo brentq
+solver import SciPy inside the call, render pulls in Matplotlib and
+Pillow, and spreadsheet loading imports pandas when a sheet is read.
+`python -m barrel.importtime` measures the cost of each.
+"""
+
+import importlib
+
+_SUBMODULES = {
+    "bench", "cli", "columns", "decks", "design", "enrich", "fleet", "gauges", "geometry",
+    "importtime", "instrument", "layers", "loadtest", "memo", "montecarlo", "planner",
+    "precision", "profiles", "reference", "render", "service", "simulate", "store", "strapping",
+    "stream", "surrogate", "tilt", "uncertainty",
+}
+
+# name -> submodule that defines it
+_EXPORTS = {
+    "segment_area": "geometry",
+    "exact_volume": "geometry",
+    "solve_level": "geometry",
+    "level_bounds": "geometry",
+    "full_volume": "geometry",
+    "volume_slope": "geometry",
+    "surface_area": "geometry",
+    "volume_gradient": "geometry",
+    "Fleet": "fleet",
+    "VolumeCache": "memo",
+    "GaugeStream": "stream",
+    "BarrelRegistry": "stream",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_EXPORTS))
@@ -0,0 +1,255 @@
+# ==========================================================
+# Benchmark suite with regression gates
+#   python -m barrel.bench --out bench.json
+#   python -m barrel.bench --baseline bench.json --max-slowdown 1.5
+# Author: Mahmud Tijani
+#
+# Fixed seeds and geometries (R = 37.5, H = 100, the standard alpha_list
+# and V_list). Every backend is timed (best of --repeat runs) and its
+# levels b are compared with a tight-tolerance quad + brentq reference
+# and the volume at those levels with the target.
+# The run fails (exit code 1) when a backend is slower than the baseline
+# by more than --max-slowdown or less accurate than its threshold.
+# ==========================================================
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+from . import geometry, instrument, montecarlo, reference
+
+# ====================================================
+# Fixed geometry
+# ====================================================
+R = 37.5
+H = 100.0
+V_TARGET = 58315.81
+ALPHA_LIST = [89.9, 80, 70, 60, 50, 40, 30, 20, 10, 0.1]
+V_LIST = [
+    58315.81, 55165.81, 52015.81, 48865.81, 45715.81,
+    42565.81, 39415.81, 36265.81, 33115.81, 29965.81,
+]
+V_ALPHA = 0.1
+
+# Maximum relative volume error |V(b) - V_target| / V_target per backend.
+# (|b - b_ref| is also recorded, but near 90 deg dV/db is tiny and a
+# large level error is still a small volume error.)
+ACCURACY = {
+    "quad_brentq": 1e-8,
+    "closed_form": 1e-8,
+    "cpp": 1e-6,
+    "mc_bisection": 0.02,
+    "mc_brentq": 0.02,
+}
+
+CPP_SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "inclined_volume.cpp")
+
+
+def cases():
+    """(alpha_deg, V_target) pairs: the alpha sweep then the volume sweep."""
+    return [(a, V_TARGET) for a in ALPHA_LIST] + [(V_ALPHA, V) for V in V_LIST]
+
+
+def reference_levels():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return np.array([reference.solve_b(V, R, H, np.tan(np.deg2rad(a)), xtol=1e-13,
+                                           epsabs=0.0, epsrel=1e-13, limit=200)
+                         for a, V in cases()])
+
+
+def best_time(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+# ====================================================
+# Backends: each returns the solved b for every case
+# ====================================================
+def run_quad_brentq():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return np.array([reference.solve_b(V, R, H, np.tan(np.deg2rad(a))) for a, V in cases()])
+
+
+def run_closed_form():
+    alpha, V = np.array(cases()).T
+    return geometry.solve_level(V, R, H, np.tan(np.deg2rad(alpha)))
+
+
+def run_mc_bisection(n_mc=1_000_000):
+    sampler = montecarlo.MCSampler(R, H, n_mc=n_mc, seed=123)
+    return np.array([sampler.solve_b(V, np.tan(np.deg2rad(a)))[0] for a, V in cases()])
+
+
+def run_mc_brentq(n_mc=200_000):
+    return np.array([montecarlo.solve_b_brentq(V, R, H, np.tan(np.deg2rad(a)), n_mc=n_mc, seed=1)
+                     for a, V in cases()])
+
+
+def build_cpp(workdir):
+    """Compiles inclined_volume.cpp with -O2, or returns None without a compiler."""
+    cxx = shutil.which(os.environ.get("CXX", "g++"))
+    if cxx is None or not os.path.exists(CPP_SOURCE):
+        return None
+    exe = os.path.join(workdir, "inclined_volume")
+    subprocess.run([cxx, "-O2", "-o", exe, CPP_SOURCE], check=True, capture_output=True)
+    return exe
+
+
+def run_cpp(exe):
+    """The C++ program solves the alpha sweep only; NaN for the volume sweep."""
+    out = subprocess.run([exe], check=True, capture_output=True, text=True).stdout
+    rows = re.findall(r"^\s*([\d.]+)\s*\|\s*(-?[\d.]+)\s*\|", out, flags=re.M)
+    b = np.full(len(cases()), np.nan)
+    b[:len(rows)] = [float(row[1]) for row in rows]
+    return b
+
+
+def run_render(workdir):
+    """Renders a fixed 10-row synthetic sheet in every view at low DPI."""
+    import pandas as pd
+    from .render import RenderSettings, from_frame, render
+    from .render.views import VIEWS
+
+    alpha = np.array(ALPHA_LIST)
+    m = np.tan(np.deg2rad(alpha))
+    b = geometry.solve_level(V_TARGET, R, H, m)
+    df = pd.DataFrame({
+        "S/N": np.arange(1, 11), "Alpha": alpha, "K_eff": np.linspace(0.80, 0.90, 10),
+        "Radius": R, "Volume(cm^3)": V_TARGET, "m": m, "b": b,
+    })
+    outputs = {view: os.path.join(workdir, f"bench_{view}.gif") for view in VIEWS}
+    render(from_frame(df, "bench"), outputs, RenderSettings(dpi=40, quality="preview"))
+
+
+# ====================================================
+# Suite
+# ====================================================
+def run_suite(repeat=3, skip=()):
+    b_ref = reference_levels()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        backends = {
+            "quad_brentq": run_quad_brentq,
+            "closed_form": run_closed_form,
+            "mc_bisection": run_mc_bisection,
+            "mc_brentq": run_mc_brentq,
+        }
+        if "cpp" not in skip:
+            exe = build_cpp(workdir)
+            if exe is not None:
+                backends["cpp"] = lambda: run_cpp(exe)
+
+        for name, fn in backends.items():
+            if name in skip:
+                continue
+            seconds, b = best_time(fn, repeat)
+            ok = ~np.isnan(b)
+            V = geometry.exact_volume(b[ok], R, H, np.tan(np.deg2rad(np.array(cases())[ok, 0])))
+            V_target = np.array(cases())[ok, 1]
+            results[name] = {
+                "seconds": seconds,
+                "cases": int(ok.sum()),
+                "max_abs_err_b": float(np.max(np.abs(b[ok] - b_ref[ok]))),
+                "max_rel_err_V": float(np.max(np.abs(V - V_target) / V_target)),
+            }
+
+        if "render" not in skip:
+            seconds, _ = best_time(lambda: run_render(workdir), max(1, repeat // 3))
+            results["render"] = {"seconds": seconds, "cases": 10}
+
+    return results
+
+
+def check(results, baseline=None, max_slowdown=None, accuracy=ACCURACY):
+    """Returns the list of gate failures."""
+    failures = []
+    for name, res in results.items():
+        limit = accuracy.get(name)
+        if limit is not None and res["max_rel_err_V"] > limit:
+            failures.append(f"{name}: |dV|/V = {res['max_rel_err_V']:.3g} > {limit:g}")
+        base = (baseline or {}).get(name)
+        if base and max_slowdown and res["seconds"] > base["seconds"] * max_slowdown:
+            failures.append(f"{name}: {res['seconds']:.4f} s is more than {max_slowdown:g}x "
+                            f"the baseline {base['seconds']:.4f} s")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.bench",
+                                     description="Time and check every solver backend.")
+    parser.add_argument("--out", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="previous results JSON to compare timings with")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    parser.add_argument("--max-error", action="append", default=[], metavar="BACKEND=TOL",
+                        help="override the relative volume error threshold of a backend")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profile", metavar="PATH",
+                        help="also run every backend once under instrumentation and write "
+                             "PATH (JSON) and PATH.folded (collapsed stacks)")
+    parser.add_argument("--skip", action="append", default=[],
+                        help="backend to skip (quad_brentq, closed_form, mc_bisection, "
+                             "mc_brentq, cpp, render)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(repeat=args.repeat, skip=set(args.skip))
+    if args.profile:
+        with instrument.recording(memory=True) as rec:
+            run_suite(repeat=1, skip=set(args.skip))
+        rec.save(args.profile)
+        rec.save_collapsed(args.profile + ".folded")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    accuracy = dict(ACCURACY)
+    for item in args.max_error:
+        name, _, tol = item.partition("=")
+        accuracy[name] = float(tol)
+    failures = check(results, baseline, args.max_slowdown, accuracy)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "R": R, "H": H, "alpha_list": ALPHA_LIST, "V_list": V_LIST,
+        },
+        "results": results,
+        "failures": failures,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'Backend':>14} | {'Time (s)':>10} | {'max |db| (cm)':>14} | {'max dV/V':>10}")
+    print("-" * 58)
+    for name, res in results.items():
+        print(f"{name:>14} | {res['seconds']:10.4f} | {res.get('max_abs_err_b', float('nan')):14.3g}"
+              f" | {res.get('max_rel_err_V', float('nan')):10.3g}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"Results written to {args.out}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# ==========================================================
+# Command line entry point
+#   python -m barrel convert readings.csv --backend exact > volumes.csv
+#   gauge_feed | python -m barrel convert --format jsonl --backend surrogate
+#   gauge_feed | python -m barrel stream --registry barrels.json
+# Author: Mahmud Tijani
+# ==========================================================
+
+import argparse
+import csv
+import io
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+# Accepted spellings of every record field
+FIELDS = {
+    "R":      ("R", "radius", "Radius"),
+    "H":      ("H", "height", "Height"),
+    "alpha":  ("alpha", "Alpha", "alpha_deg"),
+    "m":      ("m",),
+    "level":  ("b", "level"),
+    "volume": ("volume", "V", "Volume(cm^3)"),
+}
+
+
+# ==========================================================
+# Backends: (volume(b, R, H, m), level(V, R, H, m))
+# ==========================================================
+def get_backend(name, n_mc=20_000, seed=123):
+    if name == "exact":
+        from . import geometry
+        return geometry.exact_volume, geometry.solve_level
+    if name == "surrogate":
+        from . import surrogate
+        return surrogate.volume, surrogate.level
+    if name == "float32":
+        from . import precision
+        return precision.volume, precision.level
+    if name == "mc":
+        from .montecarlo import UnitSampler
+        sampler = UnitSampler(n_mc=n_mc, seed=seed)
+        return sampler.volume, sampler.solve_level
+    raise ValueError(f"Unknown backend '{name}'")
+
+
+# ==========================================================
+# Record parsing
+# ==========================================================
+def _float(value):
+    if value is None or value == "":
+        return math.nan
+    return float(value)
+
+
+def _resolve(keys):
+    """Maps our field names to the spelling used by the input, if any."""
+    return {field: next((name for name in names if name in keys), None)
+            for field, names in FIELDS.items()}
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _columns(records, names, get):
+    return {field: np.array([_float(get(rec, name)) for rec in records]) if name else None
+            for field, name in names.items()}
+
+
+# ==========================================================
+# Conversion of one chunk
+# ==========================================================
+def convert_columns(cols, backend, defaults):
+    """Fills the missing level or volume of every record, vectorized."""
+    n = len(next(c for c in cols.values() if c is not None))
+
+    def column(field):
+        values = cols.get(field)
+        return np.full(n, np.nan) if values is None else values
+
+    R = np.where(np.isnan(column("R")), defaults["R"], column("R"))
+    H = np.where(np.isnan(column("H")), defaults["H"], column("H"))
+    m = column("m")
+    alpha = np.where(np.isnan(column("alpha")), defaults["alpha"], column("alpha"))
+    m = np.where(np.isnan(m), np.tan(np.deg2rad(alpha)), m)
+
+    level, V = column("level").copy(), column("volume").copy()
+    volume_fn, level_fn = backend
+
+    want_level = ~np.isnan(V)
+    want_volume = ~want_level & ~np.isnan(level)
+    if want_level.any():
+        level[want_level] = level_fn(V[want_level], R[want_level], H[want_level], m[want_level])
+    if want_volume.any():
+        V[want_volume] = volume_fn(level[want_volume], R[want_volume], H[want_volume], m[want_volume])
+    return level, V
+
+
+def _fmt(value):
+    return "" if math.isnan(value) else format(value, ".10g")
+
+
+def convert_stream(lines, out, backend, defaults, fmt="auto", chunk_size=65536):
+    """Converts CSV or JSON-lines records from lines to out; returns stats."""
+    lines = iter(lines)
+    first = next(lines, "")
+    while first and not first.strip():
+        first = next(lines, "")
+    if fmt == "auto":
+        fmt = "jsonl" if first.lstrip().startswith("{") else "csv"
+
+    stats = {"records": 0, "chunks": 0}
+    if not first:
+        return stats
+
+    if fmt == "csv":
+        header = next(csv.reader([first]))
+        names = _resolve(header)
+        level_col = names["level"] or "b"
+        volume_col = names["volume"] or "volume"
+        out_header = header + [c for c in (level_col, volume_col) if c not in header]
+        index = {name: i for i, name in enumerate(header)}
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(out_header)
+        level_at, volume_at = out_header.index(level_col), out_header.index(volume_col)
+
+        def get(row, name):
+            i = index[name]
+            return row[i] if i < len(row) else None
+
+        rows = (row for row in csv.reader(lines) if row)
+        for chunk in _chunks(rows, chunk_size):
+            level, V = convert_columns(_columns(chunk, names, get), backend, defaults)
+            for row, lv, vol in zip(chunk, level, V):
+                row = row + [""] * (len(out_header) - len(row))
+                row[level_at] = _fmt(lv)
+                row[volume_at] = _fmt(vol)
+                writer.writerow(row)
+            stats["records"] += len(chunk)
+            stats["chunks"] += 1
+    else:
+        def records():
+            for line in [first] if first.strip() else []:
+                yield json.loads(line)
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+        for chunk in _chunks(records(), chunk_size):
+            names = _resolve(set().union(*chunk))
+            level, V = convert_columns(_columns(chunk, names, dict.get), backend, defaults)
+            level_key, volume_key = names["level"] or "b", names["volume"] or "volume"
+            for rec, lv, vol in zip(chunk, level, V):
+                rec[level_key] = None if math.isnan(lv) else float(lv)
+                rec[volume_key] = None if math.isnan(vol) else float(vol)
+                out.write(json.dumps(rec) + "\n")
+            stats["records"] += len(chunk)
+            stats["chunks"] += 1
+    return stats
+
+
+# ==========================================================
+# Sub-commands
+# ==========================================================
+def cmd_convert(args):
+    backend = get_backend(args.backend, n_mc=args.mc_samples)
+    defaults = {"R": args.R, "H": args.H, "alpha": args.alpha}
+    source = open(args.input, newline="") if args.input != "-" else sys.stdin
+    out = io.TextIOWrapper(sys.stdout.buffer, newline="", write_through=False) \
+        if hasattr(sys.stdout, "buffer") else sys.stdout
+
+    t0 = time.perf_counter()
+    try:
+        stats = convert_stream(source, out, backend, defaults, fmt=args.format,
+                               chunk_size=args.chunk_size)
+    finally:
+        out.flush()
+        if out is not sys.stdout:
+            # Unhook the wrapper so collecting it does not close the process's stdout
+            out.detach()
+        if source is not sys.stdin:
+            source.close()
+    elapsed = time.perf_counter() - t0
+
+    if not args.quiet:
+        rate = stats["records"] / elapsed if elapsed > 0 else float("inf")
+        print(f"{stats['records']} records in {stats['chunks']} chunks, {elapsed:.3f} s "
+              f"({rate:,.0f} records/s, backend {args.backend})", file=sys.stderr)
+    return 0
+
+
+def cmd_stream(args):
+    from .stream import BarrelRegistry, GaugeStream
+
+    stream = GaugeStream(BarrelRegistry.load(args.registry), tau=args.tau)
+    source = open(args.input) if args.input != "-" else sys.stdin
+
+    def readings():
+        for line in source:
+            if line.strip():
+                rec = json.loads(line)
+                yield rec["barrel_id"], float(rec["timestamp"]), float(rec["level"]), \
+                    float(rec.get("tilt", 0.0))
+
+    try:
+        for est in stream.run(readings()):
+            sys.stdout.write(json.dumps(est._asdict()) + "\n")
+            sys.stdout.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m barrel",
+                                     description="Inclined barrel volume tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("convert", help="level <-> volume over CSV / JSON-lines records",
+                       description="Each record carries a level (b) or a volume; the other "
+                                   "is computed. Geometry fields R, H and alpha (deg) or m "
+                                   "fall back to the defaults below.")
+    p.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    p.add_argument("--format", choices=("auto", "csv", "jsonl"), default="auto")
+    p.add_argument("--backend", choices=("exact", "surrogate", "float32", "mc"), default="exact")
+    p.add_argument("--chunk-size", type=int, default=65536)
+    p.add_argument("--mc-samples", type=int, default=20_000)
+    p.add_argument("--R", type=float, default=37.5, help="default radius (cm)")
+    p.add_argument("--H", type=float, default=100.0, help="default height (cm)")
+    p.add_argument("--alpha", type=float, default=0.0, help="default tilt (deg)")
+    p.add_argument("--quiet", action="store_true", help="no throughput summary on stderr")
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("stream", help="gauge readings -> smoothed volume and flow rate",
+                       description="JSON-lines readings {barrel_id, timestamp (s), level (cm), "
+                                   "tilt (deg)} in, one estimate per reading out.")
+    p.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    p.add_argument("--registry", required=True,
+                   help='JSON file {"<barrel_id>": {"R": .., "H": ..}, ...}')
+    p.add_argument("--tau", type=float, default=5.0, help="smoothing time constant (s)")
+    p.set_defaults(func=cmd_stream)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,28 @@
+# ==========================================================
+# Workbook column mapping
+# Each field lists the header spellings used across the sheets,
+# the first one being the canonical name written by our tools.
+# ==========================================================
+
+COLUMNS = {
+    "serial":        ["S/N", "Serial_No"],
+    "height":        ["Height_of_liquid (cm)"],
+    "k_eff":         ["K_eff"],
+    "alpha":         ["Alpha"],
+    "volume":        ["Volume(cm^3)"],
+    "radius":        ["Radius"],
+    "volume_litres": ["Volume(litres)"],
+    "volume_octave": ["Volume in Octave (cm^3)"],
+    "surface":       ["Surface(cm^2)", "Surface Area (cm²)"],
+    "surface_ratio": ["surface_area_vol_ratio (cm ^ -1)", "Surface-to-Volume Ratio (cm⁻¹)"],
+    "m":             ["m"],
+    "b":             ["b"],
+}
+
+
+def find_column(columns, field):
+    """Returns the first spelling of field present in columns, or None."""
+    for name in COLUMNS[field]:
+        if name in columns:
+            return name
+    return None
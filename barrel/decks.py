@@ -0,0 +1,207 @@
+# ==========================================================
+# Batch transport-input (Serpent / Octave) deck generator
+#   python -m barrel.decks decks/ --alpha 0 10 20 30 --volume 2e4 5e4 1e5 --template serpent
+#   python -m barrel.decks decks/ --alpha 0 45 90 --volume 58315.81 --template my_case.tmpl
+# Author: Mahmud Tijani
+#
+# A sweep grid (every combination of R, H, alpha and target volume) is
+# solved in one geometry.solve_level call; V_check and the surface come
+# from the closed forms at the solved b. Each case is rendered from a
+# string.Template with the fields
+#     $R $H $alpha $m $b $volume $volume_check $surface
+# (numbers formatted with FORMAT, so equal geometries give equal decks).
+# A deck is named by the SHA-256 of its content, <prefix>-<hash16><ext>:
+# repeated grid points collapse before rendering, and decks whose file
+# already exists (from an earlier run) are skipped. Target volumes
+# outside (0, pi R^2 H] are dropped by the CLI (exit code 1), and
+# generate() refuses cases whose V_check misses the target by more than
+# VOLUME_TOL, so no deck carries a clamped level. Rendering and
+# writing are split over a process pool; manifest.csv in the output
+# directory lists every deck written with its geometry and volumes.
+# ==========================================================
+
+import argparse
+import csv
+import hashlib
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+
+import numpy as np
+
+from . import geometry
+
+FORMAT = "{:.10g}"
+FIELDS = ("R", "H", "alpha", "m", "b", "volume", "volume_check", "surface")
+MANIFEST = "manifest.csv"
+VOLUME_TOL = 1e-6     # accepted relative |volume_check - volume| of a deck
+
+# Fuel: inside the cylinder along x in [0, H] and below the plane
+# y = b - m*x, i.e. m*x + y - b <= 0 (Serpent: plane A B C D is Ax+By+Cz-D = 0)
+SERPENT = """\
+% Inclined barrel: R = $R cm, H = $H cm, alpha = $alpha deg
+% plane y = b - m*x with m = $m, b = $b
+% fuel volume $volume cm^3 (closed form at b: $volume_check cm^3)
+
+surf s_barrel cylx 0.0 0.0 $R 0.0 $H
+surf s_level  plane $m 1.0 0.0 $b
+
+cell c_fuel  0 fuel   -s_barrel -s_level
+cell c_void  0 void   -s_barrel  s_level
+cell c_out   0 outside s_barrel
+
+set title "barrel R=$R H=$H alpha=$alpha"
+"""
+
+OCTAVE = """\
+% Inclined barrel: R = $R cm, H = $H cm, alpha = $alpha deg
+R = $R;
+H = $H;
+m = $m;
+b = $b;
+V_target = $volume;
+A = @(h) R^2*acos(-max(min(h, R), -R)/R) + max(min(h, R), -R).*sqrt(R^2 - max(min(h, R), -R).^2);
+if abs(m) < 1e-12
+  V = H*A(b);
+else
+  V = integral(A, b - m*H, b)/m;
+end
+printf("Volume in Octave (cm^3): %.6f (target %.6f)\\n", V, V_target);
+"""
+
+TEMPLATES = {"serpent": (SERPENT, ".inp"), "octave": (OCTAVE, ".m")}
+
+
+def sweep(R, H, alpha, volume):
+    """Solved planes for every combination of the given values (dict of arrays)."""
+    grid = np.array(list(itertools.product(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                              for v in (R, H, alpha, volume)))))
+    R, H, alpha, V = grid.T
+    m = np.tan(np.deg2rad(alpha))
+    b = geometry.solve_level(V, R, H, m)
+    return {"R": R, "H": H, "alpha": alpha, "m": m, "b": b, "volume": V,
+            "volume_check": geometry.exact_volume(b, R, H, m),
+            "surface": geometry.surface_area(b, R, H, m)}
+
+
+def feasible(cases):
+    """Mask of the cases whose target volume fits the barrel, 0 < V <= pi R^2 H."""
+    V = cases["volume"]
+    return (V > 0) & (V <= geometry.full_volume(cases["R"], cases["H"]))
+
+
+def select(cases, mask):
+    return {name: values[mask] for name, values in cases.items()}
+
+
+def _render_chunk(args):
+    """Renders, hashes and writes one chunk of cases; returns (hash, file, written) per case."""
+    template, ext, directory, prefix, cases = args
+    template = Template(template)
+    out = []
+    for values in cases:
+        deck = template.substitute(dict(zip(FIELDS, values)))
+        digest = hashlib.sha256(deck.encode()).hexdigest()
+        name = f"{prefix}-{digest[:16]}{ext}"
+        path = os.path.join(directory, name)
+        written = not os.path.exists(path)
+        if written:
+            with open(path + ".tmp", "w") as f:
+                f.write(deck)
+            os.replace(path + ".tmp", path)
+        out.append((digest, name, written))
+    return out
+
+
+def generate(directory, cases, template="serpent", prefix="barrel", workers=0, chunk=64):
+    """
+    Writes one deck per distinct case (dict of arrays from sweep()) into
+    directory; returns (written, skipped) counts. template is a key of
+    TEMPLATES or a template file path. Raises ValueError if a case's
+    volume_check misses its volume by more than VOLUME_TOL.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        error = np.abs(cases["volume_check"] - cases["volume"]) / cases["volume"]
+    bad = np.flatnonzero(~(error <= VOLUME_TOL))
+    if bad.size:
+        i = bad[0]
+        raise ValueError(f"{bad.size} case(s) off target, e.g. R={cases['R'][i]:g} "
+                         f"H={cases['H'][i]:g} alpha={cases['alpha'][i]:g}: volume "
+                         f"{cases['volume'][i]:g} but {cases['volume_check'][i]:g} at b")
+    if template in TEMPLATES:
+        text, ext = TEMPLATES[template]
+    else:
+        with open(template) as f:
+            text = f.read()
+        # my_case.inp.tmpl -> .inp, my_case.m -> .m
+        ext = os.path.splitext(template[:-5] if template.endswith(".tmpl") else template)[1]
+    os.makedirs(directory, exist_ok=True)
+
+    # Equal formatted values render equal decks: drop repeats before rendering
+    rows = [tuple(FORMAT.format(v) for v in values)
+            for values in zip(*(cases[name].tolist() for name in FIELDS))]
+    rows = list(dict.fromkeys(rows))
+    jobs = [(text, ext, directory, prefix, rows[i:i + chunk]) for i in range(0, len(rows), chunk)]
+    if workers:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_render_chunk, jobs))
+    else:
+        results = list(map(_render_chunk, jobs))
+
+    written = skipped = 0
+    manifest = os.path.join(directory, MANIFEST)
+    new_file = not os.path.exists(manifest)
+    with open(manifest, "a", newline="") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(("sha256", "file") + FIELDS)
+        for job, result in zip(jobs, results):
+            for values, (digest, name, was_written) in zip(job[4], result):
+                if was_written:
+                    writer.writerow((digest, name) + values)
+                    written += 1
+                else:
+                    skipped += 1
+    return written, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.decks",
+                                     description="Render transport input decks for a sweep grid.")
+    parser.add_argument("directory")
+    parser.add_argument("--R", type=float, nargs="+", default=[37.5])
+    parser.add_argument("--H", type=float, nargs="+", default=[100.0])
+    parser.add_argument("--alpha", type=float, nargs="+", required=True, help="tilts (deg)")
+    parser.add_argument("--volume", type=float, nargs="+", required=True, help="fuel volumes (cm^3)")
+    parser.add_argument("--template", default="serpent",
+                        help=f"{' | '.join(TEMPLATES)} or a string.Template file")
+    parser.add_argument("--prefix", default="barrel")
+    parser.add_argument("--workers", type=int, default=0, help="process pool size (0: in-process)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    cases = sweep(args.R, args.H, args.alpha, args.volume)
+    ok = feasible(cases)
+    for i in np.flatnonzero(~ok):
+        V_full = geometry.full_volume(cases["R"][i], cases["H"][i])
+        print(f"R={cases['R'][i]:g} H={cases['H'][i]:g} alpha={cases['alpha'][i]:g}: volume "
+              f"{cases['volume'][i]:g} outside (0, {V_full:g}], skipped", file=sys.stderr)
+    cases = select(cases, ok)
+    if not ok.any():
+        return 1
+    error = np.max(np.abs(cases["volume_check"] - cases["volume"]) / cases["volume"])
+    try:
+        written, skipped = generate(args.directory, cases, args.template, args.prefix, args.workers)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{len(cases['b'])} cases: {written} decks written, {skipped} already present "
+          f"({time.perf_counter() - t0:.2f} s); max volume error {error:.1e}")
+    return 0 if ok.all() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+# ==========================================================
+# Constant-volume barrel design search (inclined_barrelR.py, continuous)
+#   python -m barrel.design --metric wetted_ratio --sense min --workers 4
+#   python -m barrel.design --metric free_surface --sense max --constraint aspect 0.5 2
+# Author: Mahmud Tijani
+#
+# A design is (R, alpha, fill): the barrel keeps V_barrel, so
+# H = V_barrel / (pi R^2), and holds V = fill * V_barrel of fuel at tilt
+# alpha. evaluate() solves the level for a whole population at once
+# (geometry.solve_level) and derives every metric in METRICS from the
+# closed forms. optimize() runs differential evolution (rand/1/bin) on
+# the box BOUNDS; constraints are metric ranges, handled by the
+# feasibility rule (feasible beats infeasible, then smaller violation,
+# then better objective). screen() evaluates a random sample and keeps
+# the best. With workers > 0 each population is split into chunks that
+# are evaluated on a process pool.
+# ==========================================================
+
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import geometry
+
+V_BARREL = 441786.4669     # cm^3, as in inclined_barrelR.py
+BOUNDS = {"R": (30.0, 45.0), "alpha": (0.0, 60.0), "fill": (0.05, 0.95)}
+VARIABLES = ("R", "alpha", "fill")
+# Batches below 2 * MIN_CHUNK are evaluated in-process: the pool only pays
+# off for large screens, and the default DE popsize (256) never uses it
+MIN_CHUNK = 4096
+
+METRICS = {
+    "wetted_ratio": "wetted area / fuel volume (1/cm)",
+    "surface_ratio": "(wetted + free surface) / fuel volume (1/cm)",
+    "wetted": "wetted area (cm^2)",
+    "free_surface": "free-surface area (cm^2)",
+    "surface": "wetted + free surface (cm^2)",
+    "b": "level b (cm)",
+    "H": "barrel length (cm)",
+    "aspect": "H / (2R)",
+}
+
+
+def evaluate(R, alpha, fill, V_barrel=V_BARREL):
+    """All METRICS (and the design itself) for arrays of designs."""
+    R, alpha, fill = (np.array(v) for v in np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (R, alpha, fill))))
+    H = V_barrel / (math.pi * R**2)
+    m = np.tan(np.deg2rad(alpha))
+    V = fill * V_barrel
+    b = geometry.solve_level(V, R, H, m)
+    wetted = geometry.wetted_area(b, R, H, m)
+    free = geometry.free_surface_area(b, R, H, m)
+    return {
+        "R": R, "alpha": alpha, "fill": fill, "H": H, "V": V, "b": b,
+        "wetted": wetted, "free_surface": free, "surface": wetted + free,
+        "wetted_ratio": wetted / V, "surface_ratio": (wetted + free) / V,
+        "aspect": H / (2.0 * R),
+    }
+
+
+def _evaluate_chunk(args):
+    X, V_barrel = args
+    return evaluate(X[:, 0], X[:, 1], X[:, 2], V_barrel)
+
+
+class _Evaluator:
+    """Population -> metrics, in-process or split over a process pool."""
+
+    def __init__(self, V_barrel, workers=0):
+        self.V_barrel = V_barrel
+        self.workers = workers or 0
+        self.pool = ProcessPoolExecutor(self.workers) if self.workers > 0 else None
+        self.count = 0
+
+    def __call__(self, X):
+        self.count += len(X)
+        if self.pool is None or len(X) < 2 * MIN_CHUNK:
+            return _evaluate_chunk((X, self.V_barrel))
+        chunks = np.array_split(X, min(self.workers, len(X) // MIN_CHUNK))
+        parts = list(self.pool.map(_evaluate_chunk, [(c, self.V_barrel) for c in chunks]))
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def _score(result, metric, sense, constraints):
+    """(objective to minimize, total constraint violation) per design."""
+    objective = np.array(result[metric] if sense == "min" else -result[metric])
+    violation = np.zeros(len(objective))
+    for name, (lo, hi) in (constraints or {}).items():
+        value = result[name]
+        if lo is not None:
+            violation += np.maximum(lo - value, 0.0) / max(abs(lo), 1.0)
+        if hi is not None:
+            violation += np.maximum(value - hi, 0.0) / max(abs(hi), 1.0)
+    return objective, violation
+
+
+def _better(f_new, v_new, f_old, v_old):
+    """Feasibility rule: lower violation wins, ties go to the objective."""
+    return (v_new < v_old) | ((v_new == v_old) & (f_new <= f_old))
+
+
+def _box(bounds):
+    bounds = {**BOUNDS, **(bounds or {})}
+    lo = np.array([bounds[v][0] for v in VARIABLES], dtype=float)
+    hi = np.array([bounds[v][1] for v in VARIABLES], dtype=float)
+    return lo, hi
+
+
+def _design(result, v, i):
+    """Design i of result (all metrics) with its constraint violation."""
+    return {key: float(values[i]) for key, values in result.items()} | {"violation": float(v[i])}
+
+
+def _best(result, f, v):
+    return _design(result, v, int(np.lexsort((f, v))[0]))
+
+
+def _check(metric, sense, constraints):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'")
+    if sense not in ("min", "max"):
+        raise ValueError("sense must be 'min' or 'max'")
+    for name in constraints or {}:
+        if name not in METRICS:
+            raise ValueError(f"Unknown constraint metric '{name}'")
+
+
+def screen(metric, sense="min", n=100_000, bounds=None, constraints=None, V_barrel=V_BARREL,
+           top=10, workers=0, seed=0):
+    """Evaluates n random designs; returns the top designs (best first) and the count."""
+    _check(metric, sense, constraints)
+    lo, hi = _box(bounds)
+    X = lo + (hi - lo) * np.random.default_rng(seed).random((n, 3))
+    evaluator = _Evaluator(V_barrel, workers)
+    try:
+        result = evaluator(X)
+    finally:
+        evaluator.close()
+    f, v = _score(result, metric, sense, constraints)
+    order = np.lexsort((f, v))[:top]
+    return [_design(result, v, i) for i in order], n
+
+
+def optimize(metric, sense="min", bounds=None, constraints=None, V_barrel=V_BARREL,
+             popsize=256, generations=60, F=0.7, CR=0.9, tol=1e-10, workers=0, seed=0):
+    """
+    Differential evolution over (R, alpha, fill). Returns the best design
+    (all metrics, plus its constraint violation) and the run statistics.
+    """
+    _check(metric, sense, constraints)
+    rng = np.random.default_rng(seed)
+    lo, hi = _box(bounds)
+    X = lo + (hi - lo) * rng.random((popsize, 3))
+    evaluator = _Evaluator(V_barrel, workers)
+    try:
+        result = evaluator(X)
+        f, v = _score(result, metric, sense, constraints)
+        history = []
+        gen = -1
+        for gen in range(generations):
+            # rand/1 mutation with three distinct partners per member
+            r = np.argsort(rng.random((popsize, popsize - 1)), axis=1)[:, :3]
+            r += r >= np.arange(popsize)[:, None]
+            mutant = X[r[:, 0]] + F * (X[r[:, 1]] - X[r[:, 2]])
+            cross = rng.random((popsize, 3)) < CR
+            cross[np.arange(popsize), rng.integers(0, 3, popsize)] = True
+            trial = np.clip(np.where(cross, mutant, X), lo, hi)
+
+            trial_result = evaluator(trial)
+            f_t, v_t = _score(trial_result, metric, sense, constraints)
+            win = _better(f_t, v_t, f, v)
+            X[win] = trial[win]
+            f[win], v[win] = f_t[win], v_t[win]
+            for key in result:
+                result[key][win] = trial_result[key][win]
+
+            feasible = v == 0
+            history.append(float(f[feasible].min()) if feasible.any() else math.nan)
+            spread = np.ptp(f[feasible]) if feasible.sum() > 1 else math.inf
+            if spread <= tol * (1.0 + abs(history[-1])):
+                break
+    finally:
+        evaluator.close()
+
+    best = _best(result, f, v)
+    sign = 1.0 if sense == "min" else -1.0
+    return best, {"generations": gen + 1, "evaluations": evaluator.count,
+                  "history": [sign * h for h in history]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.design",
+                                     description="Constant-volume barrel design search.")
+    parser.add_argument("--metric", choices=sorted(METRICS), default="wetted_ratio")
+    parser.add_argument("--sense", choices=("min", "max"), default="min")
+    parser.add_argument("--V-barrel", type=float, default=V_BARREL)
+    for name in VARIABLES:
+        parser.add_argument(f"--{name}", type=float, nargs=2, metavar=("LO", "HI"),
+                            help=f"range of {name} (default {BOUNDS[name][0]:g} {BOUNDS[name][1]:g})")
+    parser.add_argument("--constraint", nargs=3, action="append", default=[],
+                        metavar=("METRIC", "LO", "HI"), help="'-' leaves a side open")
+    parser.add_argument("--screen", type=int, metavar="N", help="random screening of N designs")
+    parser.add_argument("--popsize", type=int, default=256)
+    parser.add_argument("--generations", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=0, help="process pool size (0: in-process)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bounds = {name: getattr(args, name) for name in VARIABLES if getattr(args, name)}
+    constraints = {name: tuple(None if x == "-" else float(x) for x in (lo, hi))
+                   for name, lo, hi in args.constraint}
+    workers = os.cpu_count() if args.workers < 0 else args.workers
+
+    t0 = time.perf_counter()
+    if args.screen:
+        designs, n = screen(args.metric, args.sense, args.screen, bounds, constraints,
+                            args.V_barrel, workers=workers, seed=args.seed)
+    else:
+        best, stats = optimize(args.metric, args.sense, bounds, constraints, args.V_barrel,
+                               args.popsize, args.generations, workers=workers, seed=args.seed)
+        designs, n = [best], stats["evaluations"]
+    elapsed = time.perf_counter() - t0
+
+    print(f"{n} designs evaluated in {elapsed:.2f} s ({n / elapsed:,.0f}/s)")
+    print(f"{'R (cm)':>8} | {'H (cm)':>9} | {'alpha':>7} | {'fill':>6} | {'b (cm)':>9} | "
+          f"{args.metric:>14} | violation")
+    print("-" * 80)
+    for d in designs:
+        print(f"{d['R']:8.3f} | {d['H']:9.3f} | {d['alpha']:7.3f} | {d['fill']:6.3f} | "
+              f"{d['b']:9.4f} | {d[args.metric]:14.6g} | {d['violation']:.3g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
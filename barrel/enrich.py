@@ -0,0 +1,84 @@
+# ==========================================================
+# Spreadsheet enrichment: m, b, volume, surface and S/V columns
+#   python -m barrel.enrich workbook.xlsx --sheet "Task 4"
+#   python -m barrel.enrich workbook.xlsx --sheet "Task 4" --parquet task4.parquet
+# Author: Mahmud Tijani
+# ==========================================================
+
+import argparse
+
+import numpy as np
+
+from . import geometry
+from .columns import COLUMNS, find_column
+
+BARREL_HEIGHT = 100.0                        # cm, P6 constant
+VOLUME_EXACT_COL = "Volume exact (cm^3)"     # check volume at the solved b
+
+
+def enrich_arrays(alpha_deg, R, V_target, H=BARREL_HEIGHT):
+    """
+    Derived columns for arrays of Alpha (deg), Radius and target volume,
+    keyed by COLUMNS field (or VOLUME_EXACT_COL for the check volume).
+    """
+    m = np.tan(np.deg2rad(alpha_deg))
+    b = geometry.solve_level(V_target, R, H, m)
+    V = geometry.exact_volume(b, R, H, m)
+    S = geometry.surface_area(b, R, H, m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = S / V
+    return {"m": m, "b": b, VOLUME_EXACT_COL: V, "surface": S, "surface_ratio": ratio}
+
+
+def enrich_frame(df, H=BARREL_HEIGHT):
+    """Returns a copy of df with the derived columns filled in, all rows at once."""
+    out = df.copy()
+    out.columns = out.columns.astype(str).str.strip()
+
+    inputs = {}
+    for field in ("alpha", "radius", "volume"):
+        name = find_column(out.columns, field)
+        if name is None:
+            raise KeyError(f"Sheet has no {COLUMNS[field][0]!r} column")
+        inputs[field] = out[name].to_numpy(dtype=float)
+
+    derived = enrich_arrays(inputs["alpha"], inputs["radius"], inputs["volume"], H)
+    for field, values in derived.items():
+        if field in COLUMNS:
+            name = find_column(out.columns, field) or COLUMNS[field][0]
+        else:
+            name = field
+        out[name] = values
+    return out
+
+
+def enriched_sheet_name(sheet):
+    return f"{sheet} enriched"[:31]   # Excel limits sheet names to 31 characters
+
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(prog="python -m barrel.enrich",
+                                     description="Fill m, b, volume, surface and S/V columns.")
+    parser.add_argument("workbook")
+    parser.add_argument("--sheet", default="Task 4")
+    parser.add_argument("--height", type=float, default=BARREL_HEIGHT, help="barrel height (cm)")
+    parser.add_argument("--parquet", help="write a Parquet file instead of a new sheet")
+    args = parser.parse_args(argv)
+
+    df = enrich_frame(pd.read_excel(args.workbook, sheet_name=args.sheet), H=args.height)
+
+    if args.parquet:
+        df.to_parquet(args.parquet, index=False)
+        print(f"{len(df)} rows written to {args.parquet}")
+    else:
+        name = enriched_sheet_name(args.sheet)
+        with pd.ExcelWriter(args.workbook, mode="a", engine="openpyxl",
+                            if_sheet_exists="replace") as writer:
+            df.to_excel(writer, sheet_name=name, index=False)
+        print(f"{len(df)} rows written to sheet '{name}' of {args.workbook}")
+
+
+if __name__ == "__main__":
+    main()
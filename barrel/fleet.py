@@ -0,0 +1,152 @@
+# ==========================================================
+# Fleet inventory: many barrels as struct-of-arrays records
+# Author: Mahmud Tijani
+#
+#     fleet = Fleet()
+#     fleet.add(R=37.5, H=100.0, alpha=[0.1, 10, 10], level=[5.0, 12.8, 30.0])
+#     fleet.add(R=R_list, H=V_barrel / (np.pi * R_list**2), alpha=0.1, level=b)
+#     V = fleet.volumes()            # per barrel, one vectorized pass
+#     fleet.total_volume(), fleet.group_totals()
+#
+# Distinct geometries (R, H, m) are stored once in GEOMETRY_DTYPE rows;
+# every barrel is a BARREL_DTYPE row of 24 bytes (id, geometry index,
+# level, volume) in one contiguous structured array that grows by
+# doubling. Evaluation is grouped by geometry: the exact backend gathers
+# the geometry columns and makes one call, the surrogate backend builds
+# one table per group and interpolates the group's levels in one call.
+# ==========================================================
+
+import numpy as np
+
+from . import geometry, surrogate
+
+GEOMETRY_DTYPE = np.dtype([("R", "f8"), ("H", "f8"), ("m", "f8")])
+BARREL_DTYPE = np.dtype([("id", "u4"), ("geometry", "u4"), ("level", "f8"), ("volume", "f8")])
+
+
+class Fleet:
+    """Barrels grouped by identical geometry."""
+
+    def __init__(self, capacity=1024):
+        self.geometries = np.empty(0, dtype=GEOMETRY_DTYPE)
+        self._geometry_index = {}
+        self._barrels = np.empty(capacity, dtype=BARREL_DTYPE)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def barrels(self):
+        """The barrel records (a view; edits write through)."""
+        return self._barrels[:self._n]
+
+    @property
+    def nbytes(self):
+        return self.barrels.nbytes + self.geometries.nbytes
+
+    # ------------------------------------------------------
+    # Building
+    # ------------------------------------------------------
+    def _geometry_ids(self, R, H, m):
+        unique, inverse = surrogate.group_geometries(R, H, m)
+        ids = np.empty(len(unique), dtype=np.uint32)
+        new = []
+        for g, row in enumerate(map(tuple, unique)):
+            index = self._geometry_index.get(row)
+            if index is None:
+                index = self._geometry_index[row] = len(self.geometries) + len(new)
+                new.append(row)
+            ids[g] = index
+        if new:
+            self.geometries = np.concatenate([self.geometries, np.array(new, dtype=GEOMETRY_DTYPE)])
+        return ids[inverse]
+
+    def add(self, R, H, level, alpha=None, m=None, ids=None):
+        """
+        Appends barrels; arguments broadcast together. The tilt is alpha
+        (deg) or m. Returns the ids of the new barrels.
+        """
+        if m is None:
+            m = np.tan(np.deg2rad(0.0 if alpha is None else alpha))
+        R, H, m, level = (np.ravel(a) for a in np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (R, H, m, level))))
+        if np.any(R <= 0) or np.any(H <= 0):
+            raise ValueError("R and H must be positive")
+        n = len(level)
+        if ids is None:
+            ids = np.arange(self._n, self._n + n)
+
+        if self._n + n > len(self._barrels):
+            grown = np.empty(max(2 * len(self._barrels), self._n + n), dtype=BARREL_DTYPE)
+            grown[:self._n] = self._barrels[:self._n]
+            self._barrels = grown
+        new = self._barrels[self._n:self._n + n]
+        new["id"] = ids
+        new["geometry"] = self._geometry_ids(R, H, m)
+        new["level"] = level
+        new["volume"] = np.nan
+        self._n += n
+        return new["id"].copy()
+
+    def set_levels(self, level, index=slice(None)):
+        """Updates levels (of the barrels at row index) and clears their volumes."""
+        barrels = self.barrels
+        barrels["level"][index] = level
+        barrels["volume"][index] = np.nan
+
+    # ------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------
+    def _columns(self):
+        geo = self.geometries[self.barrels["geometry"]]
+        return geo["R"], geo["H"], geo["m"]
+
+    def _by_group(self, method, x):
+        """Applies a surrogate table method to x, one table per geometry."""
+        g = self.barrels["geometry"]
+        order = np.argsort(g, kind="stable")
+        starts = np.searchsorted(g[order], np.arange(len(self.geometries) + 1))
+        out = np.empty(len(x))
+        for k, (R, H, m) in enumerate(self.geometries.tolist()):
+            rows = order[starts[k]:starts[k + 1]]
+            if len(rows):
+                out[rows] = getattr(surrogate.table(R, H, m), method)(x[rows])
+        return out
+
+    def volumes(self, backend="exact"):
+        """Per-barrel fuel volume (cm^3); also stored in the records."""
+        level = self.barrels["level"]
+        if backend == "exact":
+            V = geometry.exact_volume(level, *self._columns())
+        elif backend == "surrogate":
+            V = self._by_group("volume", level)
+        else:
+            raise ValueError(f"Unknown backend '{backend}'")
+        self.barrels["volume"] = V
+        return V
+
+    def levels_for(self, V, backend="exact"):
+        """Levels b giving each barrel the volume V (broadcast over the fleet)."""
+        V = np.broadcast_to(np.asarray(V, dtype=float), (self._n,))
+        if backend == "exact":
+            return geometry.solve_level(V, *self._columns())
+        if backend == "surrogate":
+            return self._by_group("level", V)
+        raise ValueError(f"Unknown backend '{backend}'")
+
+    def _current_volumes(self):
+        V = self.barrels["volume"]
+        if np.isnan(V).any():
+            V = self.volumes()
+        return V
+
+    def total_volume(self):
+        return float(self._current_volumes().sum())
+
+    def group_totals(self):
+        """(geometries, barrel count, total volume) per distinct geometry."""
+        g = self.barrels["geometry"]
+        k = len(self.geometries)
+        return (self.geometries, np.bincount(g, minlength=k),
+                np.bincount(g, weights=self._current_volumes(), minlength=k))
@@ -0,0 +1,144 @@
+# ==========================================================
+# Tilt, level and volume from gauge readings at known positions
+#   python -m barrel.gauges readings.csv > estimates.csv
+# Author: Mahmud Tijani
+#
+#     est = estimate(x=[10.0, 90.0], h=[[-3.1, 4.2], [12.0, 12.1]], R=37.5, H=100.0)
+#     est["alpha"], est["b"], est["volume"], est["flags"]
+#
+# A gauge at axial position x reads the fuel surface height h = b - m*x
+# (relative to the axis, or from the bottom with datum="bottom"). Two
+# readings fix the plane: m = (h1 - h2) / (x2 - x1), b = h1 + m*x1; with
+# more, the line is a least-squares fit and the RMS misfit is reported.
+# The volume is geometry.exact_volume(b, R, H, m). Everything is one
+# vectorized pass over the barrels (rows).
+#
+# flags (bit mask, 0 = consistent):
+#   RANGE     a reading lies outside the section, |h| > R
+#   CLIPPED   a reading sits at the wall (|h| ~ R): the barrel is dry or
+#             full there, so the plane is only bounded by it
+#   POSITION  gauge positions coincide or lie outside [0, H]
+#   STEEP     |alpha| > max_alpha
+#   RESIDUAL  RMS misfit of 3+ readings above tol
+#   METER     metered volume (V_meter) differs by more than meter_tol
+# ==========================================================
+
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+from . import geometry
+
+RANGE, CLIPPED, POSITION, STEEP, RESIDUAL, METER = (1 << k for k in range(6))
+FLAG_NAMES = {RANGE: "range", CLIPPED: "clipped", POSITION: "position", STEEP: "steep",
+              RESIDUAL: "residual", METER: "meter"}
+
+ESTIMATE_DTYPE = np.dtype([("alpha", "f8"), ("m", "f8"), ("b", "f8"), ("volume", "f8"),
+                           ("residual", "f8"), ("flags", "u2")])
+
+WALL_TOL = 1e-6        # relative to R: readings this close to +-R count as clipped
+
+
+def describe(flags):
+    """Flag names of one mask, e.g. ['clipped', 'steep']."""
+    return [name for bit, name in FLAG_NAMES.items() if flags & bit]
+
+
+def estimate(x, h, R, H, datum="axis", max_alpha=45.0, tol=0.1, V_meter=None, meter_tol=0.01):
+    """
+    Plane and volume per barrel from readings h (rows: barrels, columns:
+    gauges) at positions x (per gauge, or per barrel and gauge). R and H
+    broadcast over the barrels. tol is the accepted RMS misfit (cm),
+    meter_tol the accepted relative volume difference.
+    """
+    h = np.atleast_2d(np.asarray(h, dtype=float))
+    x = np.broadcast_to(np.asarray(x, dtype=float), h.shape)
+    n, k = h.shape
+    if k < 2:
+        raise ValueError("Need readings at two or more positions")
+    R = np.broadcast_to(np.asarray(R, dtype=float), (n,))
+    H = np.broadcast_to(np.asarray(H, dtype=float), (n,))
+    if datum == "bottom":
+        h = h - R[:, None]
+    elif datum != "axis":
+        raise ValueError(f"Unknown datum '{datum}'")
+
+    # Least-squares line h = b - m*x per row (exact for two readings)
+    x_mean = x.mean(axis=1)
+    h_mean = h.mean(axis=1)
+    dx = x - x_mean[:, None]
+    sxx = np.einsum("ij,ij->i", dx, dx)
+    sxh = np.einsum("ij,ij->i", dx, h - h_mean[:, None])
+    position = (sxx <= 1e-12 * H**2) | np.any((x < 0) | (x > H[:, None]), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = np.where(position, 0.0, -sxh / np.where(position, 1.0, sxx))
+    b = h_mean + m * x_mean
+    residual = np.sqrt(np.mean((h - (b[:, None] - m[:, None] * x))**2, axis=1))
+
+    out = np.empty(n, dtype=ESTIMATE_DTYPE)
+    out["m"] = m
+    out["alpha"] = np.rad2deg(np.arctan(m))
+    out["b"] = b
+    out["volume"] = geometry.exact_volume(b, R, H, m)
+    out["residual"] = residual
+
+    depth = np.abs(h) / R[:, None]
+    flags = np.where(np.any(depth > 1.0 + WALL_TOL, axis=1), RANGE, 0)
+    flags |= np.where(np.any(np.abs(depth - 1.0) <= WALL_TOL, axis=1), CLIPPED, 0)
+    flags |= np.where(position, POSITION, 0)
+    flags |= np.where(np.abs(out["alpha"]) > max_alpha, STEEP, 0)
+    flags |= np.where(residual > tol, RESIDUAL, 0)
+    if V_meter is not None:
+        V_meter = np.broadcast_to(np.asarray(V_meter, dtype=float), (n,))
+        scale = np.maximum(np.abs(V_meter), geometry.full_volume(R, H) * 1e-9)
+        flags |= np.where(np.abs(out["volume"] - V_meter) > meter_tol * scale, METER, 0)
+    out["flags"] = flags
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m barrel.gauges",
+        description="Recover tilt, level and volume from paired gauge readings (CSV in/out). "
+                    "Input columns: id, x1, h1, x2, h2 and optionally R, H, V_meter.")
+    parser.add_argument("input", nargs="?", default="-", help="CSV file, '-' for stdin")
+    parser.add_argument("--R", type=float, default=37.5, help="default radius (cm)")
+    parser.add_argument("--H", type=float, default=100.0, help="default length (cm)")
+    parser.add_argument("--datum", choices=("axis", "bottom"), default="axis")
+    parser.add_argument("--max-alpha", type=float, default=45.0)
+    parser.add_argument("--tol", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    f = sys.stdin if args.input == "-" else open(args.input, newline="")
+    with f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return 0
+
+    def column(name, default=None):
+        if name in rows[0]:
+            return np.array([float(r[name]) for r in rows])
+        if default is None:
+            raise SystemExit(f"missing column '{name}'")
+        return np.full(len(rows), default)
+
+    x = np.stack([column("x1"), column("x2")], axis=1)
+    h = np.stack([column("h1"), column("h2")], axis=1)
+    V_meter = column("V_meter") if "V_meter" in rows[0] else None
+    est = estimate(x, h, column("R", args.R), column("H", args.H), datum=args.datum,
+                   max_alpha=args.max_alpha, tol=args.tol, V_meter=V_meter)
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["id", "alpha", "b", "volume", "residual", "flags"])
+    ids = [r.get("id", str(i)) for i, r in enumerate(rows)]
+    for barrel_id, e in zip(ids, est.tolist()):
+        alpha, _, b, V, residual, flags = e
+        writer.writerow([barrel_id, f"{alpha:.6f}", f"{b:.6f}", f"{V:.4f}", f"{residual:.3g}",
+                         "|".join(describe(flags)) or "ok"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
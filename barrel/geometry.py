@@ -0,0 +1,203 @@
+# ==========================================================
+# Inclined cylinder geometry, closed form and vectorized
+# Author: Mahmud Tijani
+#
+# Barrel axis along x in [0, H], circular section of radius R.
+# The fuel fills the points with  y <= b - m*x,  m = tan(alpha),
+# so the liquid depth coordinate in the section at x is h = b - m*x.
+#
+# Every function broadcasts over NumPy arrays and depends on NumPy only.
+# The volume is the same integral as exact_volume() in the scripts,
+#     V = 1/m * integral_{b-mH}^{b} segment_area(h) dh,
+# evaluated with the antiderivative of the segment area instead of quad.
+#
+# Note: the segment area is  R^2*acos(-h/R) + h*sqrt(R^2 - h^2).
+# The scripts subtract the second term, which only agrees at h = 0, +-R
+# (its derivative is not the chord length); the Monte Carlo scripts
+# sample the correct geometry.
+# ==========================================================
+
+import numpy as np
+
+from . import instrument
+from .instrument import instrumented
+
+# Below this |m|*H / R the slope is treated as zero (avoids 0/0)
+FLAT_SLOPE = 1e-6
+
+
+def _arrays(*args):
+    return np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in args))
+
+
+# ==========================================================
+# Circular segment and its antiderivatives
+# ==========================================================
+def segment_area(h, R):
+    """Area of the circle of radius R below the chord at height h."""
+    h, R = _arrays(h, R)
+    hc = np.clip(h, -R, R)
+    return R**2 * np.arccos(-hc / R) + hc * np.sqrt(R**2 - hc**2)
+
+
+def chord_length(h, R):
+    """Width of the circle at height h, i.e. d segment_area / dh."""
+    h, R = _arrays(h, R)
+    hc = np.clip(h, -R, R)
+    return 2.0 * np.sqrt(R**2 - hc**2)
+
+
+def segment_area_integral(h, R):
+    """Antiderivative of segment_area, zero at h = -R and pi*R^2*h above R."""
+    h, R = _arrays(h, R)
+    hc = np.clip(h, -R, R)
+    s = np.sqrt(R**2 - hc**2)
+    G = R**2 * hc * np.arccos(-hc / R) + R**2 * s - s**3 / 3.0
+    return G + np.pi * R**2 * np.maximum(h - R, 0.0)
+
+
+def wetted_arc_integral(h, R):
+    """Antiderivative of the wetted wall arc length 2*R*acos(-h/R)."""
+    h, R = _arrays(h, R)
+    hc = np.clip(h, -R, R)
+    P = 2.0 * R * (hc * np.arccos(-hc / R) + np.sqrt(R**2 - hc**2))
+    return P + 2.0 * np.pi * R * np.maximum(h - R, 0.0)
+
+
+# ==========================================================
+# Tilted plane integrals
+# ==========================================================
+def _along_axis(F, f, b, R, H, m):
+    """
+    Integral over x in [0, H] of f(b - m*x), given its antiderivative F.
+    Falls back to H * f(midpoint) for (near) flat planes.
+    """
+    b, R, H, m = _arrays(b, R, H, m)
+    flat = np.abs(m) * H <= FLAT_SLOPE * R
+    m_safe = np.where(flat, 1.0, m)
+    sloped = (F(b, R) - F(b - m_safe * H, R)) / m_safe
+    level = f(b - 0.5 * m * H, R) * H
+    return np.where(flat, level, sloped)
+
+
+def full_volume(R, H):
+    R, H = _arrays(R, H)
+    return np.pi * R**2 * H
+
+
+def level_bounds(R, H, m):
+    """Range of b between the empty and the full barrel."""
+    R, H, m = _arrays(R, H, m)
+    mH = m * H
+    return -R + np.minimum(mH, 0.0), R + np.maximum(mH, 0.0)
+
+
+@instrumented("geometry.exact_volume")
+def exact_volume(b, R, H, m):
+    """Fuel volume below the plane y = b - m*x."""
+    instrument.count("geometry.exact_volume.elements", np.size(b))
+    return _along_axis(segment_area_integral, segment_area, b, R, H, m)
+
+
+@instrumented("geometry.volume_slope")
+def volume_slope(b, R, H, m):
+    """dV/db, the free-surface area projected on the axial plane."""
+    return _along_axis(segment_area, chord_length, b, R, H, m)
+
+
+def _arc_length(h, R):
+    h, R = _arrays(h, R)
+    return 2.0 * R * np.arccos(-np.clip(h, -R, R) / R)
+
+
+@instrumented("geometry.volume_gradient")
+def volume_gradient(b, R, H, m):
+    """
+    Closed-form partial derivatives of exact_volume:
+        dV/db = (A(b) - A(b - mH)) / m                 (volume_slope)
+        dV/dm = (H*A(b - mH) - V) / m,  -H^2/2 * w(b) when flat
+        dV/dR = wetted wall area   (dG/dR = 2R(h*acos(-h/R) + s))
+        dV/dH = A(b - mH)
+    with A the segment area and w the chord length. dV/dalpha is
+    dV/dm * (1 + m^2) per radian.
+    """
+    b, R, H, m = _arrays(b, R, H, m)
+    A_end = segment_area(b - m * H, R)
+    flat = np.abs(m) * H <= FLAT_SLOPE * R
+    m_safe = np.where(flat, 1.0, m)
+    dV_dm = np.where(flat, -0.5 * H**2 * chord_length(b - 0.5 * m * H, R),
+                     (H * A_end - exact_volume(b, R, H, m)) / m_safe)
+    return {
+        "b": volume_slope(b, R, H, m),
+        "m": dV_dm,
+        "R": _along_axis(wetted_arc_integral, _arc_length, b, R, H, m),
+        "H": A_end,
+    }
+
+
+@instrumented("geometry.wetted_area")
+def wetted_area(b, R, H, m):
+    """Wall area plus end-disc segments in contact with the fuel."""
+    b, R, H, m = _arrays(b, R, H, m)
+    wall = _along_axis(wetted_arc_integral, _arc_length, b, R, H, m)
+    return wall + segment_area(b, R) + segment_area(b - m * H, R)
+
+
+def free_surface_area(b, R, H, m):
+    """Area of the free surface (the plane cut through the barrel)."""
+    return np.sqrt(1.0 + np.asarray(m, dtype=float)**2) * volume_slope(b, R, H, m)
+
+
+def surface_area(b, R, H, m):
+    """Total surface bounding the fuel: wetted area plus free surface."""
+    return wetted_area(b, R, H, m) + free_surface_area(b, R, H, m)
+
+
+# ==========================================================
+# Inverse problem: volume -> b
+# ==========================================================
+@instrumented("geometry.solve_level")
+def solve_level(V, R, H, m, tol=1e-10, maxiter=100, b0=None):
+    """
+    Vectorized inverse of exact_volume: the b giving volume V.
+
+    Safeguarded Newton iteration (bisection whenever a step leaves the
+    bracket), iterating only on the elements not yet converged. Like the
+    scripts, V <= 0 returns b_min - 1 and V >= V_full returns b_max + 1.
+    b0 is an optional starting guess (e.g. a nearby solution).
+    """
+    V, R, H, m = _arrays(V, R, H, m)
+    shape = V.shape
+    V, R, H, m = V.ravel(), R.ravel(), H.ravel(), m.ravel()
+    b_min, b_max = level_bounds(R, H, m)
+    V_full = full_volume(R, H)
+
+    if b0 is None:
+        b = b_min + (b_max - b_min) * np.clip(V / V_full, 0.0, 1.0)
+    else:
+        b = np.clip(np.broadcast_to(np.asarray(b0, dtype=float), shape).ravel(), b_min, b_max)
+    idx = np.flatnonzero((V > 0) & (V < V_full))
+    lo, hi = b_min[idx], b_max[idx]
+
+    for _ in range(maxiter):
+        if idx.size == 0:
+            break
+        instrument.count("geometry.solve_level.iterations")
+        instrument.count("geometry.solve_level.element_iterations", idx.size)
+        bi, Ri, Hi, mi = b[idx], R[idx], H[idx], m[idx]
+        f = exact_volume(bi, Ri, Hi, mi) - V[idx]
+        lo = np.where(f < 0, bi, lo)
+        hi = np.where(f > 0, bi, hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            b_new = bi - f / volume_slope(bi, Ri, Hi, mi)
+        outside = ~((b_new > lo) & (b_new < hi))
+        b_new = np.where(outside, 0.5 * (lo + hi), b_new)
+
+        done = (np.abs(f) <= tol * V_full[idx]) | (hi - lo <= tol * (1.0 + np.abs(bi)))
+        b[idx] = np.where(done, bi, b_new)
+        keep = ~done
+        idx, lo, hi = idx[keep], lo[keep], hi[keep]
+
+    b = np.where(V <= 0, b_min - 1, b)
+    b = np.where(V >= V_full, b_max + 1, b)
+    return b.reshape(shape)
@@ -0,0 +1,103 @@
+# ==========================================================
+# Import-time measurement
+#   python -m barrel.importtime                  # the default module list
+#   python -m barrel.importtime barrel.geometry --max-ms 150
+# Author: Mahmud Tijani
+#
+# Every module is imported in a fresh interpreter under -X importtime,
+# repeated --repeat times (best run kept). Reported per module: the
+# cumulative import time, the wall time of the whole interpreter, the
+# slowest dependencies, and which heavy optional packages got loaded.
+# Exit code 1 if a module exceeds --max-ms.
+# ==========================================================
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+
+MODULES = [
+    "barrel",
+    "barrel.geometry",
+    "barrel.surrogate",
+    "barrel.fleet",
+    "barrel.stream",
+    "barrel.reference",
+    "barrel.montecarlo",
+    "barrel.cli",
+    "barrel.service",
+    "barrel.render",
+    "barrel.render.renderer",
+]
+HEAVY = ("scipy", "matplotlib", "pandas", "PIL")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", re.M)
+
+_PROBE = ("import {module}; import sys; "
+          "print(*[m for m in {heavy!r} if m in sys.modules], sep=',')")
+
+
+def measure(module, repeat=3):
+    """Import cost of module in a fresh interpreter (best of repeat)."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                               _PROBE.format(module=module, heavy=HEAVY)],
+                              capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - t0
+        rows = [(int(cum_us), len(indent), name)
+                for _, cum_us, indent, name in _LINE.findall(proc.stderr)]
+        end = max(i for i, row in enumerate(rows) if row[2] == module)
+        cumulative, depth = rows[end][:2]
+        if best is None or cumulative < best["import_ms"] * 1e3:
+            # Children of the module are listed just before it, one level deeper
+            children = []
+            for cum, d, name in reversed(rows[:end]):
+                if d <= depth:
+                    break
+                if d == depth + 2:
+                    children.append((cum, name))
+            top = sorted(children, reverse=True)
+            best = {
+                "module": module,
+                "import_ms": cumulative / 1e3,
+                "interpreter_ms": wall * 1e3,
+                "heavy_loaded": [m for m in proc.stdout.strip().split(",") if m],
+                "slowest": [{"module": name, "ms": cum / 1e3} for cum, name in top[:5]],
+            }
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.importtime",
+                                     description="Measure the import time of barrel modules.")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, help="fail if a module imports slower than this")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [measure(module, args.repeat) for module in args.modules]
+
+    print(f"{'Module':>24} | {'import (ms)':>11} | {'process (ms)':>12} | heavy packages loaded")
+    print("-" * 80)
+    for res in results:
+        print(f"{res['module']:>24} | {res['import_ms']:11.1f} | {res['interpreter_ms']:12.1f} | "
+              f"{', '.join(res['heavy_loaded']) or '-'}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_ms is not None:
+        slow = [res for res in results if res["import_ms"] > args.max_ms]
+        for res in slow:
+            print(f"FAIL {res['module']}: {res['import_ms']:.1f} ms > {args.max_ms:g} ms")
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# ==========================================================
+# Opt-in instrumentation: counters, stage timings, memory peaks
+# Author: Mahmud Tijani
+#
+#     from barrel import instrument
+#     with instrument.recording(memory=True) as rec:
+#         geometry.solve_level(V, R, H, m)
+#     rec.save("profile.json")            # counters + per-stage stats
+#     rec.save_collapsed("profile.folded") # input for flamegraph.pl / speedscope
+#
+# When no recording is active every hook is a single `is None` test:
+# count() returns at once and stage() hands back a shared null context.
+# ==========================================================
+
+import contextlib
+import functools
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+
+_recorder = None
+_NULL = contextlib.nullcontext()
+
+
+class _Frame:
+    __slots__ = ("name", "path", "wall0", "cpu0", "mem0", "peak", "child_wall")
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.wall0 = time.perf_counter()
+        self.cpu0 = time.process_time()
+        self.mem0 = 0
+        self.peak = 0
+        self.child_wall = 0.0
+
+
+class Recorder:
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.counters = defaultdict(int)
+        self.stages = defaultdict(lambda: {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_bytes": 0})
+        self.self_wall = defaultdict(float)   # collapsed stack -> self time (s)
+        self._stack = []
+
+    # ------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------
+    def _enter(self, name):
+        parent = self._stack[-1] if self._stack else None
+        frame = _Frame(name, f"{parent.path};{name}" if parent else name)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            frame.mem0 = frame.peak = current
+        self._stack.append(frame)
+
+    def _exit(self):
+        frame = self._stack.pop()
+        wall = time.perf_counter() - frame.wall0
+        stats = self.stages[frame.name]
+        stats["calls"] += 1
+        stats["wall_s"] += wall
+        stats["cpu_s"] += time.process_time() - frame.cpu0
+        if self.memory:
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            stats["peak_bytes"] = max(stats["peak_bytes"], frame.peak - frame.mem0)
+        self.self_wall[frame.path] += wall - frame.child_wall
+        if self._stack:
+            parent = self._stack[-1]
+            parent.child_wall += wall
+            parent.peak = max(parent.peak, frame.peak)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    # ------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------
+    def report(self):
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "stages": {name: dict(stats) for name, stats in sorted(self.stages.items())},
+        }
+
+    def collapsed(self):
+        """Collapsed stacks ('a;b;c <self microseconds>'), one line per stack."""
+        return "".join(f"{path} {round(seconds * 1e6)}\n"
+                       for path, seconds in sorted(self.self_wall.items()))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def save_collapsed(self, path):
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+
+
+# ==========================================================
+# Hooks used by the instrumented modules
+# ==========================================================
+def active():
+    return _recorder is not None
+
+
+def count(name, n=1):
+    if _recorder is not None:
+        _recorder.counters[name] += int(n)
+
+
+def stage(name):
+    if _recorder is None:
+        return _NULL
+    return _recorder.stage(name)
+
+
+def instrumented(name):
+    """Decorator timing every call of a function as stage `name`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return fn(*args, **kwargs)
+            _recorder.counters[name + ".calls"] += 1
+            with _recorder.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def recording(memory=False):
+    """Activates a Recorder for the duration of the block."""
+    global _recorder
+    previous = _recorder
+    rec = Recorder(memory=memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _recorder = rec
+    try:
+        yield rec
+    finally:
+        _recorder = previous
+        if started:
+            tracemalloc.stop()
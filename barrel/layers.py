@@ -0,0 +1,97 @@
+# ==========================================================
+# Layered fill: settled phases stacked below parallel planes
+#   python -m barrel.layers --volumes 5000 20000 33315.81 --alpha 10
+# Author: Mahmud Tijani
+#
+#     res = solve_layers([[5e3, 2e4, 3.3e4], [0, 1e4, 5e4]], R=37.5, H=100.0, alpha=[10, 0.1])
+#     res["level"][:, i]          # interface b_i on top of layer i
+#
+# Layers are given bottom-up (e.g. solids, sludge, liquid). They settle
+# under the same gravity, so every interface is a plane y = b_i - m*x
+# parallel to the free surface, and layer i fills the slab between
+# b_{i-1} and b_i. Interface i therefore holds the cumulative volume
+#     C_i = V_1 + ... + V_i,    b_i = solve_level(C_i),
+# solved for all barrels at once, interface by interface: each solve
+# starts from a Newton step off the interface below it.
+# Per layer:
+#   wetted        wall + end area between the two planes,
+#                 wetted_area(b_i) - wetted_area(b_{i-1})
+#   free_surface  area of its top interface, free_surface_area(b_i)
+# An empty layer has b_i = b_{i-1} and zero wetted area.
+# ==========================================================
+
+import argparse
+import sys
+
+import numpy as np
+
+from . import geometry
+
+LAYERS = ("solids", "sludge", "liquid")
+
+
+def solve_layers(volumes, R=37.5, H=100.0, m=None, alpha=None):
+    """
+    Per-layer level, volume, wetted area and top free-surface area.
+    volumes is (barrels, layers), bottom layer first; R, H and the tilt
+    (m, or alpha in degrees) broadcast over the barrels.
+    """
+    if m is None:
+        m = np.tan(np.deg2rad(0.0 if alpha is None else alpha))
+    volumes = np.atleast_2d(np.asarray(volumes, dtype=float))
+    if np.any(volumes < 0):
+        raise ValueError("Layer volumes must be non-negative")
+    n, k = volumes.shape
+    R, H, m = (np.broadcast_to(np.asarray(v, dtype=float), (n,))[:, None] for v in (R, H, m))
+
+    cumulative = np.cumsum(volumes, axis=1)
+    b_min, b_max = geometry.level_bounds(R, H, m)
+    b = np.empty((n, k))
+    guess = None
+    for i in range(k):
+        b[:, i] = geometry.solve_level(cumulative[:, i], R[:, 0], H[:, 0], m[:, 0], b0=guess)
+        # Overfull interfaces sit at the top of the barrel (solve_level returns b_max + 1)
+        b[:, i] = np.clip(b[:, i], b_min[:, 0], b_max[:, 0])
+        if i + 1 < k:
+            # Newton step from this interface as the start for the next one
+            slope = geometry.volume_slope(b[:, i], R[:, 0], H[:, 0], m[:, 0])
+            guess = b[:, i] + volumes[:, i + 1] / np.maximum(slope, 1e-12 * R[:, 0] * H[:, 0])
+
+    wetted = geometry.wetted_area(b, R, H, m)
+    below = np.concatenate([np.zeros((n, 1)), wetted[:, :-1]], axis=1)
+    return {
+        "level": b,
+        "volume": np.diff(np.minimum(cumulative, geometry.full_volume(R, H)), axis=1, prepend=0.0),
+        "wetted": wetted - below,
+        "free_surface": geometry.free_surface_area(b, R, H, m),
+        "overflow": np.maximum(cumulative[:, -1] - geometry.full_volume(R[:, 0], H[:, 0]), 0.0),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.layers",
+                                     description="Interface levels and areas of a layered fill.")
+    parser.add_argument("--volumes", type=float, nargs="+", required=True,
+                        help="layer volumes (cm^3), bottom layer first")
+    parser.add_argument("--names", nargs="+", help=f"layer names (default {' '.join(LAYERS)})")
+    parser.add_argument("--R", type=float, default=37.5)
+    parser.add_argument("--H", type=float, default=100.0)
+    parser.add_argument("--alpha", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    k = len(args.volumes)
+    names = args.names or (LAYERS if k == len(LAYERS) else [f"layer {i + 1}" for i in range(k)])
+    res = solve_layers([args.volumes], args.R, args.H, alpha=args.alpha)
+    print(f"{'Layer':>10} | {'Volume (cm^3)':>14} | {'b (cm)':>10} | {'Wetted (cm^2)':>13} | "
+          f"{'Surface (cm^2)':>14}")
+    print("-" * 74)
+    for i, name in enumerate(names):
+        print(f"{name:>10} | {res['volume'][0, i]:14.4f} | {res['level'][0, i]:10.5f} | "
+              f"{res['wetted'][0, i]:13.4f} | {res['free_surface'][0, i]:14.4f}")
+    if res["overflow"][0] > 0:
+        print(f"overflow: {res['overflow'][0]:.4f} cm^3 does not fit in the barrel")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# ==========================================================
+# Load test of the volume/level service
+#   python -m barrel.loadtest --spawn --requests 5000 --concurrency 64
+#   python -m barrel.loadtest --port 8080 --batch 100
+# Author: Mahmud Tijani
+#
+# Opens --concurrency keep-alive connections and sends --requests POSTs
+# (random /level or /volume queries of --batch elements each), then
+# reports latency percentiles and throughput. --spawn starts a local
+# service on a free port for the duration of the run.
+# ==========================================================
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+async def _post(reader, writer, host, path, body):
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+def make_bodies(n, batch, seed=0):
+    rng = np.random.default_rng(seed)
+    bodies = []
+    for i in range(n):
+        alpha = rng.uniform(0.0, 80.0, batch).round(1)
+        if i % 2:
+            path, query = "/level", {"V": rng.uniform(1e3, 4e5, batch).tolist()}
+        else:
+            path, query = "/volume", {"b": rng.uniform(-37.5, 150.0, batch).tolist()}
+        if batch == 1:
+            query = {k: v[0] for k, v in query.items()}
+            alpha = alpha[:1]
+        query["alpha"] = alpha.tolist() if batch > 1 else float(alpha[0])
+        bodies.append((path, json.dumps(query).encode()))
+    return bodies
+
+
+async def run(host, port, requests, concurrency, batch):
+    bodies = make_bodies(requests, batch)
+    latencies = np.empty(requests)
+    errors = 0
+    next_index = 0
+
+    async def client():
+        nonlocal next_index, errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while next_index < requests:
+                i = next_index
+                next_index += 1
+                path, body = bodies[i]
+                t0 = time.perf_counter()
+                status = await _post(reader, writer, host, path, body)
+                latencies[i] = time.perf_counter() - t0
+                errors += status != 200
+        finally:
+            writer.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    return {
+        "requests": requests,
+        "elements": requests * batch,
+        "errors": errors,
+        "seconds": elapsed,
+        "requests_per_s": requests / elapsed,
+        "elements_per_s": requests * batch / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50) * 1e3),
+        "p99_ms": float(np.percentile(latencies, 99) * 1e3),
+        "max_ms": float(latencies.max() * 1e3),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn(port, workers):
+    cmd = [sys.executable, "-m", "barrel.service", "--port", str(port)]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
+    proc.stderr.readline()      # "Serving on ..."
+    return proc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.loadtest",
+                                     description="Latency and throughput of barrel.service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--spawn", action="store_true", help="start a local service first")
+    parser.add_argument("--workers", type=int, help="solver processes of the spawned service")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch", type=int, default=1, help="elements per request")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        args.port = _free_port()
+        proc = spawn(args.port, args.workers)
+    try:
+        report = asyncio.run(run(args.host, args.port, args.requests, args.concurrency, args.batch))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['requests']} requests ({report['elements']} elements), "
+              f"{report['errors']} errors, {report['seconds']:.3f} s")
+        print(f"throughput {report['requests_per_s']:,.0f} req/s, "
+              f"{report['elements_per_s']:,.0f} elements/s")
+        print(f"latency p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms, "
+              f"max {report['max_ms']:.2f} ms")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# ==========================================================
+# Memoizing LRU cache for volume and inverse-level queries
+# Author: Mahmud Tijani
+#
+#     cache = VolumeCache(path="volume_cache.pkl")   # loads it if present
+#     b = cache.level(58315.81, R=37.5, H=100.0, m=math.tan(alpha))
+#     V = cache.volume(b, 37.5, 100.0, m)
+#     cache.save()
+#
+# Keys are the inputs snapped to a grid (length, slope and volume
+# tolerances) and results are computed at the snapped values, so every
+# query falling in the same cell gets the same answer. Hits cost a few
+# microseconds: integer rounding plus an OrderedDict lookup.
+# ==========================================================
+
+import os
+import pickle
+from collections import OrderedDict
+
+from . import geometry
+
+LENGTH_TOL = 1e-6    # cm, for R, H and b
+SLOPE_TOL = 1e-9     # for m = tan(alpha)
+VOLUME_TOL = 1e-4    # cm^3
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, compute):
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            value = self.data[key] = compute()
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+            return value
+        self.hits += 1
+        self.data.move_to_end(key)
+        return value
+
+    def clear(self):
+        self.data.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class VolumeCache:
+    """
+    LRU caches of geometry.exact_volume and geometry.solve_level.
+
+    path, if given, is a pickle file loaded on creation and written by
+    save(), so the cache survives between runs.
+    """
+
+    def __init__(self, maxsize=65536, path=None, length_tol=LENGTH_TOL,
+                 slope_tol=SLOPE_TOL, volume_tol=VOLUME_TOL):
+        self.volumes = LRUCache(maxsize)
+        self.levels = LRUCache(maxsize)
+        self.path = path
+        self.length_tol = length_tol
+        self.slope_tol = slope_tol
+        self.volume_tol = volume_tol
+        if path and os.path.exists(path):
+            self.load(path)
+
+    # ------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------
+    def _geometry_key(self, R, H, m):
+        return (round(R / self.length_tol), round(H / self.length_tol), round(m / self.slope_tol))
+
+    def _snap(self, key):
+        R, H, m = key
+        return R * self.length_tol, H * self.length_tol, m * self.slope_tol
+
+    def volume(self, b, R, H, m):
+        key = (round(b / self.length_tol),) + self._geometry_key(R, H, m)
+
+        def compute():
+            return float(geometry.exact_volume(key[0] * self.length_tol, *self._snap(key[1:])))
+        return self.volumes.get(key, compute)
+
+    def level(self, V, R, H, m):
+        key = (round(V / self.volume_tol),) + self._geometry_key(R, H, m)
+
+        def compute():
+            return float(geometry.solve_level(key[0] * self.volume_tol, *self._snap(key[1:])))
+        return self.levels.get(key, compute)
+
+    def stats(self):
+        return {"volume": self.volumes.stats(), "level": self.levels.stats()}
+
+    def clear(self):
+        self.volumes.clear()
+        self.levels.clear()
+
+    # ------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------
+    def _tolerances(self):
+        return (self.length_tol, self.slope_tol, self.volume_tol)
+
+    def save(self, path=None):
+        path = path or self.path
+        state = {
+            "tolerances": self._tolerances(),
+            "volumes": list(self.volumes.data.items()),
+            "levels": list(self.levels.data.items()),
+        }
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    def load(self, path):
+        """Merges a saved cache; ignored if it was built with other tolerances."""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if tuple(state["tolerances"]) != self._tolerances():
+            return
+        for lru, items in ((self.volumes, state["volumes"]), (self.levels, state["levels"])):
+            for key, value in items[-lru.maxsize:]:
+                lru.data[key] = value
+
+
+_default = None
+
+
+def default_cache():
+    """Process-wide VolumeCache shared by cached_volume() and cached_level()."""
+    global _default
+    if _default is None:
+        _default = VolumeCache()
+    return _default
+
+
+def cached_volume(b, R, H, m):
+    return default_cache().volume(b, R, H, m)
+
+
+def cached_level(V, R, H, m):
+    return default_cache().level(V, R, H, m)
@@ -0,0 +1,166 @@
+# ==========================================================
+# Monte Carlo volume estimators and inverse solvers
+# Author: Mahmud Tijani
+# ==========================================================
+
+import numpy as np
+
+from . import instrument
+from .instrument import instrumented
+
+
+# ====================================================
+# Fresh samples on every call (Montecarlo.py)
+# ====================================================
+@instrumented("montecarlo.monte_carlo_volume")
+def monte_carlo_volume(b, R, H, m, n_mc=2_000_000, rng=None):
+    instrument.count("montecarlo.points_tested", n_mc)
+    rng = rng if rng is not None else np.random.default_rng()
+
+    # Sample x along cylinder axis, (y,z) uniformly in circle
+    x = rng.uniform(0.0, H, n_mc)
+    r = R * np.sqrt(rng.uniform(0.0, 1.0, n_mc))
+    theta = rng.uniform(0.0, 2*np.pi, n_mc)
+    y = r * np.cos(theta)
+
+    # Plane condition
+    frac = np.mean(y <= (b - m * x))
+    return frac * np.pi * R**2 * H
+
+
+@instrumented("montecarlo.solve_b_brentq")
+def solve_b_brentq(V_target, R, H, m, n_mc=2_000_000, seed=1, maxiter=50):
+    """brentq on the noisy MC volume, as in Montecarlo.py."""
+    from scipy.optimize import brentq
+
+    rng = np.random.default_rng(seed)
+
+    def F(b):
+        return monte_carlo_volume(b, R, H, m, n_mc, rng) - V_target
+
+    return brentq(F, -R, R + m * H, maxiter=maxiter, disp=False)
+
+
+# ====================================================
+# Fixed sample set reused for every query (pythonMCdegree.py)
+# ====================================================
+class MCSampler:
+    @instrumented("montecarlo.sample")
+    def __init__(self, R, H, n_mc=1_000_000, seed=123):
+        rng = np.random.default_rng(seed)
+        self.R, self.H = R, H
+        self.V_cyl = np.pi * R**2 * H
+        self.x = rng.uniform(0.0, H, n_mc)
+        r = R * np.sqrt(rng.uniform(0.0, 1.0, n_mc))
+        theta = rng.uniform(0.0, 2*np.pi, n_mc)
+        self.y = r * np.cos(theta)
+
+    def volume(self, b, m):
+        instrument.count("montecarlo.passes")
+        instrument.count("montecarlo.points_tested", len(self.x))
+        return np.mean(self.y <= (b - m * self.x)) * self.V_cyl
+
+    def surface_area(self, b, m):
+        """Approximate fuel surface: lateral + mean top segment (Surface_Area.py)."""
+        R = self.R
+        inside = self.y <= (b - m * self.x)
+        x_in = self.x[inside]
+        if len(x_in) == 0:
+            return 0.0
+        lateral = 2 * np.pi * R * np.mean(np.clip(b - m * x_in, 0, R))
+        y_top = np.clip(b - m * x_in, -R, R)
+        theta = np.arccos(-y_top / R)
+        top_area = np.mean(R**2 * theta + y_top * np.sqrt(R**2 - y_top**2))
+        return lateral + top_area
+
+    @instrumented("montecarlo.solve_b_mc")
+    def solve_b(self, V_target, m, tol_vol=50.0, max_iter=80):
+        """
+        Monte Carlo-safe bisection, returns (b, V).
+        tol_vol: acceptable volume error in cm^3
+        """
+        b_lo = -self.R
+        b_hi = self.R + m * self.H
+
+        for _ in range(max_iter):
+            instrument.count("montecarlo.bisection.iterations")
+            b_mid = 0.5 * (b_lo + b_hi)
+            V_mid = self.volume(b_mid, m)
+
+            if abs(V_mid - V_target) < tol_vol:
+                return b_mid, V_mid
+
+            if V_mid < V_target:
+                b_lo = b_mid
+            else:
+                b_hi = b_mid
+
+        return b_mid, V_mid  # best effort
+
+
+# ====================================================
+# Batched estimator over many geometries (unit cylinder samples)
+# ====================================================
+class UnitSampler:
+    """
+    Samples of the unit cylinder, x in [0, 1] and (y, z) in the unit disk.
+
+    A point of a barrel (R, H) lies below the plane when
+    y <= b/R - (m*H/R) * x, so one sample set serves every geometry.
+    dtype=np.float32 halves the memory traffic of the sample blocks; its
+    rounding (~1e-7) is far below the sampling noise (~1/sqrt(n_mc)).
+    """
+
+    def __init__(self, n_mc=20_000, seed=123, dtype=np.float64):
+        rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
+        self.x = rng.uniform(0.0, 1.0, n_mc).astype(self.dtype)
+        r = np.sqrt(rng.uniform(0.0, 1.0, n_mc))
+        self.y = (r * np.cos(rng.uniform(0.0, 2*np.pi, n_mc))).astype(self.dtype)
+
+    def _scaled(self, R, H, m, rows):
+        """Per-sample plane coordinate y + (m*H/R)*x for a block of records."""
+        k = (m[rows] * H[rows] / R[rows]).astype(self.dtype)[:, None]
+        return self.y[None, :] + k * self.x[None, :]
+
+    @instrumented("montecarlo.unit_volume")
+    def volume(self, b, R, H, m, batch=256):
+        b, R, H, m = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (b, R, H, m)))
+        shape = b.shape
+        b, R, H, m = b.ravel(), R.ravel(), H.ravel(), m.ravel()
+        out = np.empty(b.size)
+        for start in range(0, b.size, batch):
+            rows = slice(start, start + batch)
+            instrument.count("montecarlo.points_tested", len(self.x) * len(b[rows]))
+            z = self._scaled(R, H, m, rows)
+            out[rows] = np.mean(z <= (b[rows] / R[rows]).astype(self.dtype)[:, None], axis=1)
+        return (out * np.pi * R**2 * H).reshape(shape)
+
+    @instrumented("montecarlo.unit_level")
+    def solve_level(self, V, R, H, m, batch=256):
+        """
+        Exact inverse of volume(): the matching quantile of the samples.
+        Records sharing the slope m*H/R share one sorted sample set, so
+        the cost is one sort per distinct slope, not per record.
+        """
+        V, R, H, m = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (V, R, H, m)))
+        shape = V.shape
+        V, R, H, m = V.ravel(), R.ravel(), H.ravel(), m.ravel()
+        n = len(self.x)
+        frac = V / (np.pi * R**2 * H)
+        b_min = -R + np.minimum(m * H, 0.0)
+        b_max = R + np.maximum(m * H, 0.0)
+        # Same sentinels as geometry.solve_level; only 0 < V < V_full is sampled
+        out = np.where(frac <= 0, b_min - 1, np.where(frac >= 1, b_max + 1, np.nan))
+        inside = np.flatnonzero((frac > 0) & (frac < 1))
+        k = np.clip(np.ceil(frac[inside] * n).astype(np.intp) - 1, 0, n - 1)
+        slopes, group = np.unique(m[inside] * H[inside] / R[inside], return_inverse=True)
+        group = group.ravel()
+        order = np.argsort(group, kind="stable")
+        starts = np.searchsorted(group[order], np.arange(0, len(slopes) + batch, batch))
+        for i, start in enumerate(range(0, len(slopes), batch)):
+            slope = slopes[start:start + batch].astype(self.dtype)[:, None]
+            z = np.sort(self.y[None, :] + slope * self.x[None, :], axis=1)
+            rows = order[starts[i]:starts[i + 1]]
+            out[inside[rows]] = z[group[rows] - start, k[rows]] * R[inside[rows]]
+        return out.reshape(shape)
@@ -0,0 +1,257 @@
+# ==========================================================
+# Adaptive k_eff sampling planner
+#   python -m barrel.planner workbook.xlsx --sheet "Task 4" --batch 8
+#   python -m barrel.planner workbook.xlsx --sheet "Task 4" --alpha 0 90 --volume 2e4 1.5e5
+# Author: Mahmud Tijani
+#
+# Fits a Gaussian process (NumPy only) to the sheet's K_eff as a function
+# of (alpha, volume, R, S/V), with S/V computed from the geometry so the
+# candidates have it too. Inputs are scaled to the unit box, K_eff is
+# standardized, and the kernel is a squared exponential with one length
+# scale per input plus a noise term, chosen by maximizing the marginal
+# likelihood over a small grid (coordinate-wise).
+# Candidates are random points of the (alpha, volume, R) box, R drawn
+# from the radii already in the sheet unless a range is given. A
+# candidate's score is its posterior std plus curvature_weight times the
+# curvature of the posterior mean (sum of |second differences| along
+# alpha, volume and R), both normalized. The batch is picked greedily:
+# after each pick the point is added to the GP with its predicted value
+# ("kriging believer"), which shrinks the std around it. Both terms are
+# recomputed from the updated GP, the curvature term is scaled by the
+# fraction of the std left (std / std before the batch), and candidates
+# closer than MIN_SEPARATION (unit box, alpha / volume / R) to a pick are
+# dropped, so a curvature hotspot yields a run or two, not the batch. Each
+# proposal comes out with m, b, surface and S/V from barrel.enrich,
+# ready to run.
+# ==========================================================
+
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+from .columns import COLUMNS
+from .enrich import BARREL_HEIGHT, enrich_arrays
+
+FEATURES = ("alpha", "volume", "radius", "surface_ratio")
+LENGTH_SCALES = (0.05, 0.1, 0.2, 0.35, 0.5, 1.0, 2.0)
+NOISE = (1e-6, 1e-4, 1e-3, 1e-2, 1e-1)
+N_CANDIDATES = 4096
+CURVATURE_STEP = 0.02      # in unit-box coordinates
+MIN_SEPARATION = 0.1       # between proposals, unit-box (alpha, volume, R) distance
+
+
+# ==========================================================
+# Gaussian process
+# ==========================================================
+def _kernel(A, B, scales):
+    d = (A[:, None, :] - B[None, :, :]) / scales
+    return np.exp(-0.5 * np.einsum("ijk,ijk->ij", d, d))
+
+
+class GaussianProcess:
+    """Zero-mean GP on standardized targets, squared-exponential ARD kernel."""
+
+    def __init__(self, scales, noise):
+        self.scales = np.asarray(scales, dtype=float)
+        self.noise = float(noise)
+
+    def fit(self, X, y):
+        self.X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean, self.y_std = y.mean(), y.std() or 1.0
+        z = (y - self.y_mean) / self.y_std
+        K = _kernel(self.X, self.X, self.scales) + self.noise * np.eye(len(z))
+        self.L = np.linalg.cholesky(K)
+        self.alpha = np.linalg.solve(self.L.T, np.linalg.solve(self.L, z))
+        self.log_likelihood = (-0.5 * z @ self.alpha - np.log(np.diag(self.L)).sum()
+                               - 0.5 * len(z) * np.log(2.0 * np.pi))
+        return self
+
+    def predict(self, X, return_std=True):
+        Ks = _kernel(np.asarray(X, dtype=float), self.X, self.scales)
+        mean = self.y_mean + self.y_std * (Ks @ self.alpha)
+        if not return_std:
+            return mean
+        v = np.linalg.solve(self.L, Ks.T)
+        var = np.maximum(1.0 + self.noise - np.einsum("ij,ij->j", v, v), 0.0)
+        return mean, self.y_std * np.sqrt(var)
+
+    def loo_rmse(self):
+        """Leave-one-out RMSE in K_eff units (closed form)."""
+        K_inv = np.linalg.solve(self.L.T, np.linalg.solve(self.L, np.eye(len(self.X))))
+        return float(self.y_std * np.sqrt(np.mean((self.alpha / np.diag(K_inv))**2)))
+
+
+def fit_gp(X, y, sweeps=2):
+    """GP with length scales and noise picked by marginal likelihood (grid, per coordinate)."""
+    scales = np.full(X.shape[1], 0.35)
+    noise = 1e-4
+
+    def likelihood(s, n):
+        try:
+            return GaussianProcess(s, n).fit(X, y).log_likelihood
+        except np.linalg.LinAlgError:
+            return -np.inf
+
+    for _ in range(sweeps):
+        for d in range(X.shape[1]):
+            trials = []
+            for ls in LENGTH_SCALES:
+                s = scales.copy()
+                s[d] = ls
+                trials.append((likelihood(s, noise), ls))
+            scales[d] = max(trials)[1]
+        noise = max((likelihood(scales, n), n) for n in NOISE)[1]
+    return GaussianProcess(scales, noise).fit(X, y)
+
+
+# ==========================================================
+# Planner
+# ==========================================================
+class Planner:
+    """K_eff surrogate over (alpha, volume, R, S/V) and batch proposals."""
+
+    def __init__(self, alpha, volume, radius, k_eff, H=BARREL_HEIGHT, bounds=None):
+        alpha, volume, radius, k_eff = (np.asarray(v, dtype=float) for v in
+                                        (alpha, volume, radius, k_eff))
+        keep = ~(np.isnan(alpha) | np.isnan(volume) | np.isnan(radius) | np.isnan(k_eff))
+        if keep.sum() < 3:
+            raise ValueError("Need at least three rows with alpha, volume, radius and K_eff")
+        self.H = H
+        self.alpha, self.volume, self.radius, self.k_eff = (v[keep] for v in
+                                                            (alpha, volume, radius, k_eff))
+        self.radii = np.unique(self.radius)
+        bounds = dict(bounds or {})
+        self.bounds = {
+            "alpha": bounds.get("alpha") or (self.alpha.min(), self.alpha.max()),
+            "volume": bounds.get("volume") or (self.volume.min(), self.volume.max()),
+            "radius": bounds.get("radius") or (self.radius.min(), self.radius.max()),
+        }
+        self.discrete_radius = "radius" not in bounds
+
+        X = self.features(self.alpha, self.volume, self.radius)
+        self._unit = (X.min(axis=0), np.where(np.ptp(X, axis=0) > 0, np.ptp(X, axis=0), 1.0))
+        self.gp = fit_gp(self.unit(X), self.k_eff)
+
+    @classmethod
+    def from_sheet(cls, data, H=BARREL_HEIGHT, bounds=None):
+        """From render.data.SheetData (the workbook's columns)."""
+        return cls(data.alpha, data.fuel_volume(), data.radius, data.k_eff, H, bounds)
+
+    def features(self, alpha, volume, radius):
+        ratio = enrich_arrays(alpha, radius, volume, self.H)["surface_ratio"]
+        return np.stack([alpha, volume, radius, ratio], axis=1)
+
+    def unit(self, X):
+        lo, span = self._unit
+        return (X - lo) / span
+
+    def candidates(self, n=N_CANDIDATES, seed=0):
+        rng = np.random.default_rng(seed)
+        (a0, a1), (v0, v1), (r0, r1) = (self.bounds[k] for k in ("alpha", "volume", "radius"))
+        alpha = rng.uniform(a0, a1, n)
+        volume = rng.uniform(v0, v1, n)
+        radius = rng.choice(self.radii, n) if self.discrete_radius else rng.uniform(r0, r1, n)
+        # Keep fillable volumes only
+        fits = volume < np.pi * radius**2 * self.H
+        return alpha[fits], volume[fits], radius[fits]
+
+    def _curvature(self, gp, U):
+        """Sum over alpha, volume, R of |second difference| of the posterior mean."""
+        h = CURVATURE_STEP
+        centre = gp.predict(U, return_std=False)
+        total = np.zeros(len(U))
+        for d in range(3):      # S/V follows from the other three
+            step = np.zeros(U.shape[1])
+            step[d] = h
+            total += np.abs(gp.predict(U + step, return_std=False) - 2.0 * centre
+                            + gp.predict(U - step, return_std=False)) / h**2
+        return total
+
+    def propose(self, batch=8, n_candidates=N_CANDIDATES, curvature_weight=0.5, seed=0,
+                min_separation=MIN_SEPARATION):
+        """The next batch of geometries, with m, b, surface, S/V and the GP prediction."""
+        alpha, volume, radius = self.candidates(n_candidates, seed)
+        U = self.unit(self.features(alpha, volume, radius))
+        curvature = self._curvature(self.gp, U)
+        scale = curvature.max() or 1.0
+
+        X_fit, y_fit = self.gp.X, self.k_eff
+        gp = self.gp
+        allowed = np.ones(len(U), dtype=bool)
+        picked, picked_curvature = [], []
+        _, std0 = self.gp.predict(U)
+        std0 = np.where(std0 > 0, std0, 1.0)
+        for _ in range(min(batch, len(U))):
+            if not allowed.any():
+                break
+            _, std = gp.predict(U)
+            # Curvature counts in proportion to the std left by earlier picks
+            score = (std / (std.max() or 1.0)
+                     + curvature_weight * curvature / scale * np.minimum(std / std0, 1.0))
+            score[~allowed] = -np.inf
+            i = int(np.argmax(score))
+            picked.append(i)
+            picked_curvature.append(curvature[i] / scale)
+            allowed &= np.linalg.norm(U[:, :3] - U[i, :3], axis=1) >= min_separation
+            X_fit = np.vstack([X_fit, U[i]])
+            y_fit = np.append(y_fit, gp.predict(U[i:i + 1], return_std=False))
+            gp = GaussianProcess(self.gp.scales, self.gp.noise).fit(X_fit, y_fit)
+            curvature = self._curvature(gp, U)
+
+        picked = np.array(picked, dtype=int)
+        mean, std = self.gp.predict(U[picked])
+        derived = enrich_arrays(alpha[picked], radius[picked], volume[picked], self.H)
+        return {
+            "alpha": alpha[picked], "volume": volume[picked], "radius": radius[picked],
+            "m": derived["m"], "b": derived["b"], "surface": derived["surface"],
+            "surface_ratio": derived["surface_ratio"],
+            "k_eff_predicted": mean, "k_eff_std": std, "curvature": np.array(picked_curvature),
+        }
+
+
+def main(argv=None):
+    from .render.data import load_sheet
+
+    parser = argparse.ArgumentParser(prog="python -m barrel.planner",
+                                     description="Propose the next K_eff runs (CSV on stdout).")
+    parser.add_argument("workbook")
+    parser.add_argument("--sheet", default="Task 4")
+    parser.add_argument("--height", type=float, default=BARREL_HEIGHT)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--candidates", type=int, default=N_CANDIDATES)
+    parser.add_argument("--curvature-weight", type=float, default=0.5)
+    parser.add_argument("--min-separation", type=float, default=MIN_SEPARATION,
+                        help="between proposals, in unit-box (alpha, volume, R) coordinates")
+    for name in ("alpha", "volume", "radius"):
+        parser.add_argument(f"--{name}", type=float, nargs=2, metavar=("LO", "HI"),
+                            help=f"{name} range to explore (default: the sheet's)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bounds = {name: tuple(getattr(args, name)) for name in ("alpha", "volume", "radius")
+              if getattr(args, name)}
+    planner = Planner.from_sheet(load_sheet(args.workbook, args.sheet), args.height, bounds)
+    gp = planner.gp
+    print(f"{len(planner.k_eff)} runs, length scales {np.round(gp.scales, 3).tolist()} "
+          f"({', '.join(FEATURES)}), noise {gp.noise:g}, LOO RMSE {gp.loo_rmse():.5f}",
+          file=sys.stderr)
+
+    plan = planner.propose(args.batch, args.candidates, args.curvature_weight, args.seed,
+                           args.min_separation)
+    names = {"alpha": COLUMNS["alpha"][0], "volume": COLUMNS["volume"][0],
+             "radius": COLUMNS["radius"][0], "m": COLUMNS["m"][0], "b": COLUMNS["b"][0],
+             "surface": COLUMNS["surface"][0], "surface_ratio": COLUMNS["surface_ratio"][0],
+             "k_eff_predicted": "K_eff predicted", "k_eff_std": "K_eff std",
+             "curvature": "curvature"}
+    writer = csv.writer(sys.stdout)
+    writer.writerow(names.values())
+    for values in zip(*(plan[key].tolist() for key in names)):
+        writer.writerow([f"{v:.10g}" for v in values])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
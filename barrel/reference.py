@@ -0,0 +1,78 @@
+# ==========================================================
+# Scalar quad + brentq reference (the original script method)
+# Author: Mahmud Tijani
+#
+# Same algorithm as the scripts, with the segment-area sign fixed (see
+# barrel/geometry.py) and the quad interval clipped to [-R, R] so that
+# steep planes (89.9 deg) are not integrated over a mostly flat range.
+# ==========================================================
+
+import math
+
+from . import instrument
+from .instrument import instrumented
+
+
+# ====================================================
+# Circular segment area
+# ====================================================
+def segment_area(h, R):
+    h = max(min(h, R), -R)
+    if h >= R:
+        return math.pi * R**2
+    elif h <= -R:
+        return 0.0
+    else:
+        return R**2 * math.acos(-h / R) + h * math.sqrt(R**2 - h**2)
+
+
+# ====================================================
+# Exact inclined cylinder volume
+# ====================================================
+@instrumented("reference.exact_volume")
+def exact_volume(b, R, H, m, **quad_options):
+    from scipy.integrate import quad
+
+    if abs(m) < 1e-12:
+        return H * segment_area(b, R)
+    else:
+        h1 = b - m * H
+        h2 = b
+        h_low, h_high = min(h1, h2), max(h1, h2)
+        lo, hi = max(h_low, -R), min(h_high, R)
+        V = math.pi * R**2 * max(h_high - max(h_low, R), 0.0)
+        if hi > lo and instrument.active():
+            result = quad(lambda h: segment_area(h, R), lo, hi, full_output=1, **quad_options)
+            instrument.count("reference.quad.integrand_evals", result[2]["neval"])
+            instrument.count("reference.quad.subintervals", result[2]["last"])
+            V += result[0]
+        elif hi > lo:
+            V += quad(lambda h: segment_area(h, R), lo, hi, **quad_options)[0]
+        return V / abs(m)
+
+
+# ====================================================
+# Solve for b with brentq
+# ====================================================
+@instrumented("reference.solve_b")
+def solve_b(V_target, R, H, m, xtol=2e-12, **quad_options):
+    from scipy.optimize import brentq
+
+    V_full = math.pi * R**2 * H
+    b_min = -R
+    b_max = R + m * H
+
+    if V_target <= 0:
+        return b_min - 1
+    elif V_target >= V_full:
+        return b_max + 1
+
+    def F(b):
+        return exact_volume(b, R, H, m, **quad_options) - V_target
+
+    if instrument.active():
+        b, info = brentq(F, b_min, b_max, xtol=xtol, full_output=True)
+        instrument.count("reference.brentq.iterations", info.iterations)
+        instrument.count("reference.brentq.function_calls", info.function_calls)
+        return b
+    return brentq(F, b_min, b_max, xtol=xtol)
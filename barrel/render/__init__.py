@@ -0,0 +1,37 @@
+"""
+Barrel animation renderer: one data/geometry pass, many views.
+
+Names load on first access, so `from barrel.render import load_sheet`
+does not import Matplotlib.
+"""
+
+import importlib
+
+# name -> submodule that defines it
+_EXPORTS = {
+    "COLUMNS": "data", "SheetData": "data", "from_frame": "data", "load_sheet": "data",
+    "QUALITY": "lod", "MeshResolution": "lod", "mesh_resolution": "lod",
+    "FrameCache": "cache",
+    "RenderSettings": "renderer", "render": "renderer",
+    "render_all": "batch", "RenderError": "batch",
+    "VIEWS": "views", "View": "views", "get_view": "views",
+}
+
+__all__ = [
+    "COLUMNS", "SheetData", "from_frame", "load_sheet",
+    "QUALITY", "MeshResolution", "mesh_resolution",
+    "FrameCache", "RenderSettings", "render", "render_all", "RenderError",
+    "VIEWS", "View", "get_view",
+]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,67 @@
+# ==========================================================
+# Command line: render one sheet into one GIF per view
+#   python -m barrel.render workbook.xlsx --sheet "Task 4" --view side --view plane
+# or every sheet of the workbook with a worker pool
+#   python -m barrel.render workbook.xlsx --all-sheets --out-dir gifs --jobs 4
+# ==========================================================
+
+import argparse
+import os
+import sys
+
+from .batch import RenderError, output_name, render_all
+from .data import load_sheet
+from .lod import QUALITY
+from .renderer import RenderSettings, render
+from .views import VIEWS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.render",
+                                     description="Render workbook sheets into one GIF per view.")
+    parser.add_argument("workbook")
+    parser.add_argument("--sheet", default="Task 4")
+    parser.add_argument("--all-sheets", action="store_true", help="render every sheet concurrently")
+    parser.add_argument("--view", action="append", choices=sorted(VIEWS),
+                        help="view to render, may be repeated (default: all)")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-render even when inputs are unchanged")
+    parser.add_argument("--cache-dir", default=None, help="reuse rasterized frames stored here")
+    parser.add_argument("--frame-ms", type=int, default=RenderSettings.frame_ms)
+    parser.add_argument("--barrel-height", type=float, default=RenderSettings.barrel_height)
+    parser.add_argument("--dpi", type=int, default=RenderSettings.dpi)
+    parser.add_argument("--quality", choices=sorted(QUALITY), default=RenderSettings.quality,
+                        help="mesh level of detail")
+    args = parser.parse_args(argv)
+
+    views = args.view or sorted(VIEWS)
+    settings = RenderSettings(frame_ms=args.frame_ms, barrel_height=args.barrel_height,
+                              dpi=args.dpi, quality=args.quality)
+
+    if args.all_sheets:
+        failures = {}
+        try:
+            rendered, skipped = render_all(args.workbook, args.out_dir, views, settings,
+                                           jobs=args.jobs, force=args.force,
+                                           cache_dir=args.cache_dir)
+        except RenderError as exc:
+            rendered, skipped, failures = exc.rendered, exc.skipped, exc.failures
+        for path in sorted(rendered):
+            print(f"GIF saved as: {path}")
+        for name, exc in sorted(failures.items()):
+            print(f"FAILED {name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+        print(f"{len(rendered)} rendered, {len(skipped)} unchanged"
+              + (f", {len(failures)} failed" if failures else ""))
+        return 1 if failures else 0
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    outputs = {view: os.path.join(args.out_dir, output_name(args.sheet, view)) for view in views}
+    render(load_sheet(args.workbook, args.sheet), outputs, settings, cache=args.cache_dir)
+    for path in outputs.values():
+        print(f"GIF saved as: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
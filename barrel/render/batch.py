@@ -0,0 +1,134 @@
+# ==========================================================
+# Batch render every (sheet, view) of a workbook
+# Author: Mahmud Tijani
+# ==========================================================
+
+import dataclasses
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .data import COLUMNS, from_frame
+from .renderer import RenderSettings, render
+from .views import VIEWS
+
+MANIFEST = "render-manifest.json"
+
+
+class RenderError(RuntimeError):
+    """Some (sheet, view) jobs failed; the others were rendered and recorded."""
+
+    def __init__(self, failures, rendered, skipped):
+        self.failures = failures    # output name -> exception
+        self.rendered = rendered
+        self.skipped = skipped
+        super().__init__(f"{len(failures)} of {len(failures) + len(rendered)} renders failed: "
+                         + ", ".join(sorted(failures)))
+
+
+# ==========================================================
+# INPUT HASH
+# ==========================================================
+def job_hash(data, view, settings):
+    """Hash of everything a (sheet, view) GIF depends on."""
+    h = hashlib.sha256()
+    h.update(view.encode())
+    h.update(json.dumps(dataclasses.asdict(settings), sort_keys=True).encode())
+    for field in COLUMNS:
+        h.update(data.column(field).tobytes())
+    return h.hexdigest()
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+# ==========================================================
+# WORKBOOK
+# ==========================================================
+def read_workbook(excel_file):
+    """Opens the workbook once and returns SheetData for every usable sheet."""
+    import pandas as pd
+
+    with pd.ExcelFile(excel_file) as book:
+        frames = {name: book.parse(name) for name in book.sheet_names}
+
+    sheets = {}
+    for name, df in frames.items():
+        data = from_frame(df, name=name)
+        if len(data) and not np.isnan(data.k_eff).all():
+            sheets[name] = data
+    return sheets
+
+
+def output_name(sheet, view):
+    return f"{sheet.replace(' ', '_')}_{view}.gif"
+
+
+def _render_job(data, view, path, settings, cache_dir):
+    render(data, {view: path}, settings, cache=cache_dir)
+    return path
+
+
+# ==========================================================
+# BATCH
+# ==========================================================
+def render_all(excel_file, out_dir, views=None, settings=None, jobs=None, force=False,
+               cache_dir=None):
+    """
+    Renders every (sheet, view) combination with a worker pool.
+
+    Combinations whose input hash matches the manifest entry of an
+    existing output are skipped; with cache_dir the remaining jobs reuse
+    unchanged frames. Returns (rendered, skipped) path lists. A failed job
+    does not stop the others: once the pool is done, RenderError lists the
+    failures (the successful jobs are already in the manifest).
+    """
+    settings = settings or RenderSettings()
+    views = views or sorted(VIEWS)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    todo, skipped = {}, []
+    for sheet, data in read_workbook(excel_file).items():
+        for view in views:
+            name = output_name(sheet, view)
+            digest = job_hash(data, view, settings)
+            path = os.path.join(out_dir, name)
+            if not force and manifest.get(name) == digest and os.path.exists(path):
+                skipped.append(path)
+            else:
+                todo[name] = (data, view, path, digest)
+
+    rendered, failures = [], {}
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(_render_job, data, view, path, settings, cache_dir): name
+                       for name, (data, view, path, _) in todo.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    rendered.append(future.result())
+                except Exception as exc:
+                    failures[name] = exc
+                    continue
+                manifest[name] = todo[name][3]
+                save_manifest(out_dir, manifest)
+
+    if failures:
+        raise RenderError(failures, rendered, skipped)
+    return rendered, skipped
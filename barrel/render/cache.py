@@ -0,0 +1,56 @@
+# ==========================================================
+# On-disk cache of rasterized frames, keyed on their inputs
+# Author: Mahmud Tijani
+# ==========================================================
+
+import hashlib
+import os
+
+import numpy as np
+from PIL import Image
+
+
+def frame_key(*parts):
+    """SHA-256 of the repr of every input a frame depends on."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+class FrameCache:
+    """
+    Stores one PNG per rendered panel under <cache_dir>/<key[:2]>/<key>.png.
+
+    A panel is only re-rasterized when no file exists for the hash of
+    its inputs, so editing one row re-renders only the frames that row
+    feeds.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".png")
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        self.hits += 1
+        with Image.open(path) as im:
+            return np.asarray(im.convert("RGB"))
+
+    def put(self, key, pixels):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        Image.fromarray(pixels).save(tmp, format="PNG", compress_level=1)
+        os.replace(tmp, path)
+
+    def fetch(self, key, compute):
+        pixels = self.get(key)
+        if pixels is None:
+            pixels = compute()
+            self.put(key, pixels)
+        return pixels
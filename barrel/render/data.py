@@ -0,0 +1,82 @@
+# ==========================================================
+# Workbook ingest shared by every view
+# Author: Mahmud Tijani
+# ==========================================================
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..columns import COLUMNS, find_column
+
+AXIS_LABELS = {
+    "alpha":  "Alpha (degrees)",
+    "k_eff":  "k_eff",
+    "height": "Height_of_liquid (cm)",
+    "volume": "Volume (cm³)",
+    "radius": "Radius (cm)",
+}
+
+
+# ==========================================================
+# SHEET DATA
+# ==========================================================
+@dataclass
+class SheetData:
+    """Column arrays of one sheet, NaN where a column is absent."""
+
+    name: str
+    serial: np.ndarray
+    height: np.ndarray
+    k_eff: np.ndarray
+    alpha: np.ndarray          # degrees
+    volume: np.ndarray
+    radius: np.ndarray
+    volume_litres: np.ndarray
+    volume_octave: np.ndarray
+    surface: np.ndarray
+    surface_ratio: np.ndarray
+    m: np.ndarray
+    b: np.ndarray
+
+    def __len__(self):
+        return len(self.k_eff)
+
+    def column(self, field):
+        return getattr(self, field)
+
+    def fuel_volume(self):
+        """Octave volume where available, target volume otherwise."""
+        return np.where(np.isnan(self.volume_octave), self.volume, self.volume_octave)
+
+    def row(self, frame):
+        """Values of every field at one frame, in COLUMNS order."""
+        return tuple(float(getattr(self, field)[frame]) for field in COLUMNS)
+
+
+def _lookup(df, field):
+    name = find_column(df.columns, field)
+    if name is None:
+        return np.full(len(df), np.nan)
+    return df[name].to_numpy(dtype=float)
+
+
+def from_frame(df, name=""):
+    """Builds SheetData from an already loaded DataFrame."""
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip()
+
+    serial = _lookup(df, "serial")
+    if not np.isnan(serial).all():
+        df = df.iloc[np.argsort(serial, kind="stable")].reset_index(drop=True)
+
+    fields = {field: _lookup(df, field) for field in COLUMNS}
+    return SheetData(name=name, **fields)
+
+
+def load_sheet(excel_file, sheet_name):
+    """Reads one sheet of the workbook."""
+    import pandas as pd
+
+    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    return from_frame(df, name=sheet_name)
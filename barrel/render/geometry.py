@@ -0,0 +1,103 @@
+# ==========================================================
+# Per-frame barrel geometry shared between views
+# Author: Mahmud Tijani
+# ==========================================================
+
+import numpy as np
+
+from .lod import REFERENCE_RESOLUTION
+
+# Historical fixed mesh sizes, used when no resolution is given
+DEFAULT_RESOLUTION = REFERENCE_RESOLUTION
+
+
+def tilt(X, Y, Z, alpha):
+    """Rotates points about the X axis by alpha (radians)."""
+    return (X,
+            Y * np.cos(alpha) - Z * np.sin(alpha),
+            Y * np.sin(alpha) + Z * np.cos(alpha))
+
+
+class GeometryPipeline:
+    """
+    Solves the geometry of every frame once per render pass.
+
+    Results are memoised on their inputs, so views that ask for the same
+    mesh (same radius, height and tilt) share a single computation.
+    """
+
+    def __init__(self, data, barrel_height, resolution=DEFAULT_RESOLUTION):
+        self.data = data
+        self.barrel_height = float(barrel_height)
+        self.resolution = resolution
+        self._memo = {}
+
+    def _cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    # ------------------------------------------------------
+    # Scalar quantities
+    # ------------------------------------------------------
+    def radius(self, frame):
+        return float(self.data.radius[frame])
+
+    def alpha(self, frame):
+        return float(np.deg2rad(self.data.alpha[frame]))
+
+    def fill_height(self, frame):
+        """Standing fuel height V / (pi R^2), clipped to the barrel."""
+        def compute():
+            V = self.data.fuel_volume()[frame]
+            R = self.radius(frame)
+            h = V / (np.pi * R**2)
+            if np.isnan(h):
+                h = self.data.height[frame]
+            return float(np.clip(h, 0.0, self.barrel_height))
+        return self._cached(("fill", frame), compute)
+
+    def wall_heights(self, frame):
+        """Fuel level y = m*x + b at the left (-R) and right (+R) walls."""
+        def compute():
+            R = self.radius(frame)
+            m, b = self.data.m[frame], self.data.b[frame]
+            left = np.clip(m * (-R) + b, 0.0, self.barrel_height)
+            right = np.clip(m * R + b, 0.0, self.barrel_height)
+            return float(left), float(right)
+        return self._cached(("walls", frame), compute)
+
+    # ------------------------------------------------------
+    # Meshes
+    # ------------------------------------------------------
+    def cylinder_mesh(self, R, height, alpha, n_z):
+        """Tilted cylinder wall from z = 0 to z = height."""
+        def compute():
+            theta = np.linspace(0, 2*np.pi, self.resolution.n_theta)
+            z = np.linspace(0, height, n_z)
+            theta_grid, z_grid = np.meshgrid(theta, z)
+            X = R * np.cos(theta_grid)
+            Y = R * np.sin(theta_grid)
+            return tilt(X, Y, z_grid, alpha)
+        return self._cached(("cylinder", R, height, alpha, n_z), compute)
+
+    def barrel_mesh(self, frame):
+        return self.cylinder_mesh(self.radius(frame), self.barrel_height, self.alpha(frame),
+                                  self.resolution.n_z)
+
+    def fuel_column_mesh(self, frame):
+        return self.cylinder_mesh(self.radius(frame), self.fill_height(frame),
+                                  self.alpha(frame), self.resolution.n_fill)
+
+    def plane_fuel_mesh(self, frame):
+        """Fuel surface defined by the plane z = m*x + b, tilted with the barrel."""
+        def compute():
+            R = self.radius(frame)
+            m, b = self.data.m[frame], self.data.b[frame]
+            x = np.linspace(-R, R, self.resolution.n_disk)
+            Xp, Yp = np.meshgrid(x, x)
+            inside = Xp**2 + Yp**2 <= R**2
+            Zp = np.clip(m * Xp + b, 0, self.barrel_height)
+            Zp[~inside] = np.nan
+            return tilt(Xp, Yp, Zp, self.alpha(frame))
+        return self._cached(("plane", frame), compute)
@@ -0,0 +1,60 @@
+# ==========================================================
+# Mesh level of detail from the output resolution
+# Author: Mahmud Tijani
+# ==========================================================
+
+from dataclasses import dataclass
+
+# On-screen length of one mesh segment per preset, in pixels; "standard"
+# is the segment length of the historical meshes
+QUALITY = {
+    "preview":  24.0,
+    "standard": 10.0,
+    "final":     5.0,
+}
+
+# Fraction of the panel the 3D barrel occupies
+PANEL_FILL = 0.75
+
+
+@dataclass(frozen=True)
+class MeshResolution:
+    n_theta: int    # points around the barrel wall
+    n_z: int        # points along the barrel axis
+    n_fill: int     # points along the fuel column
+    n_disk: int     # grid points across the plane-defined fuel
+
+
+# The historical fixed meshes, drawn on the default 7-inch panel at 100 dpi
+REFERENCE_RESOLUTION = MeshResolution(n_theta=80, n_z=80, n_fill=40, n_disk=140)
+REFERENCE_PX = 7.0 * 100.0 * PANEL_FILL
+
+
+def _clamp(n, lo, hi):
+    return int(min(max(round(n), lo), hi))
+
+
+def mesh_resolution(dpi, panel_size, quality="standard"):
+    """
+    Scales the historical meshes with the on-screen size of the barrel
+    and the segment length of the preset.
+
+    "standard" on a 7-inch panel at 100 dpi gives exactly the historical
+    80-point wall and axis, 40-point fuel column and 140-point fuel grid;
+    previews get coarser meshes, final exports and higher DPI finer ones.
+    """
+    try:
+        seg_px = QUALITY[quality]
+    except KeyError:
+        raise ValueError(f"Unknown quality '{quality}', choose from {sorted(QUALITY)}") from None
+
+    barrel_px = min(panel_size) * dpi * PANEL_FILL
+    scale = (barrel_px / REFERENCE_PX) * (QUALITY["standard"] / seg_px)
+    ref = REFERENCE_RESOLUTION
+    return MeshResolution(
+        n_theta=_clamp(ref.n_theta * scale, 12, 240),
+        n_z=_clamp(ref.n_z * scale, 2, 200),
+        n_fill=_clamp(ref.n_fill * scale, 2, 100),
+        # the fuel disk is clipped by the wall, so it needs a finer grid
+        n_disk=_clamp(ref.n_disk * scale, 16, 400),
+    )
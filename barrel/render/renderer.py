@@ -0,0 +1,159 @@
+# ==========================================================
+# Single-pass multi-view GIF renderer
+# Author: Mahmud Tijani
+# ==========================================================
+
+from dataclasses import dataclass
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from .. import instrument
+
+from .cache import FrameCache, frame_key
+from .data import AXIS_LABELS
+from .geometry import GeometryPipeline
+from .lod import mesh_resolution
+from .views import get_view
+
+
+# ==========================================================
+# SETTINGS
+# ==========================================================
+@dataclass
+class RenderSettings:
+    frame_ms: int = 1500             # milliseconds per frame
+    barrel_height: float = 100.0     # cm, P6 constant
+    panel_size: tuple = (7.0, 7.0)   # inches, each of the two panels
+    dpi: int = 100
+    quality: str = "standard"        # mesh level of detail, see lod.QUALITY
+    x_axis: str = "alpha"            # SheetData field on the graph X axis
+    y_axis: str = "k_eff"            # SheetData field on the graph Y axis
+    plot_title: str = "k_eff vs Alpha"
+
+
+def _raster(fig):
+    """Draws a figure and returns a copy of its RGB pixels."""
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba())[..., :3].copy()
+
+
+def _figure(settings):
+    fig = Figure(figsize=settings.panel_size, dpi=settings.dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# ==========================================================
+# RIGHT-HAND GRAPH (drawn once, shared by every view)
+# ==========================================================
+class GraphPanel:
+    def __init__(self, data, settings):
+        self.settings = settings
+        self.x = data.column(settings.x_axis)
+        self.y = data.column(settings.y_axis)
+        self.xlim = (float(np.nanmin(self.x)), float(np.nanmax(self.x)))
+        self.ylim = (float(np.nanmin(self.y))*0.98, float(np.nanmax(self.y))*1.02)
+        self.fig = None
+
+    def _setup(self):
+        settings = self.settings
+        self.fig = _figure(settings)
+        ax = self.fig.add_subplot(111)
+        ax.set_title(settings.plot_title)
+        ax.set_xlabel(AXIS_LABELS.get(settings.x_axis, settings.x_axis))
+        ax.set_ylabel(AXIS_LABELS.get(settings.y_axis, settings.y_axis))
+        ax.grid(True, alpha=0.4)
+        ax.set_xlim(*self.xlim)
+        ax.set_ylim(*self.ylim)
+        self.line_plot, = ax.plot([], [], "b-o")
+
+    def key(self, frame):
+        s = self.settings
+        return frame_key("graph", s.panel_size, s.dpi, s.x_axis, s.y_axis, s.plot_title,
+                         self.xlim, self.ylim,
+                         self.x[:frame+1].tolist(), self.y[:frame+1].tolist())
+
+    def frame(self, frame):
+        if self.fig is None:
+            self._setup()
+        self.line_plot.set_data(self.x[:frame+1], self.y[:frame+1])
+        return _raster(self.fig)
+
+
+# ==========================================================
+# LEFT-HAND VIEW PANEL
+# ==========================================================
+class ViewPanel:
+    def __init__(self, view, geo, settings):
+        self.view = view
+        self.geo = geo
+        self.settings = settings
+        self.context = view.context(geo)
+        self.fig = None
+
+    def _setup(self):
+        self.fig = _figure(self.settings)
+        self.ax = self.fig.add_subplot(111, projection=self.view.projection)
+        self.view.setup(self.ax, self.geo)
+
+    def key(self, frame):
+        geo, s = self.geo, self.settings
+        resolution = geo.resolution if self.view.uses_mesh else None
+        return frame_key(self.view.name, s.panel_size, s.dpi, geo.barrel_height,
+                         resolution, self.context, geo.data.row(frame))
+
+    def frame(self, frame):
+        if self.fig is None:
+            self._setup()
+        self.view.draw(self.ax, self.geo, frame)
+        return _raster(self.fig)
+
+
+def _panel_frame(panel, name, frame, cache):
+    with instrument.stage(f"render.{name}"):
+        instrument.count(f"render.{name}.frames")
+        if cache is None:
+            return panel.frame(frame)
+        return cache.fetch(panel.key(frame), lambda: panel.frame(frame))
+
+
+def save_gif(frames, path, frame_ms):
+    images = [Image.fromarray(frame) for frame in frames]
+    images[0].save(path, save_all=True, append_images=images[1:],
+                   duration=frame_ms, loop=0)
+
+
+# ==========================================================
+# RENDER
+# ==========================================================
+def render(data, outputs, settings=None, cache=None):
+    """
+    Renders several views of one sheet in a single pass over its rows.
+
+    outputs maps a view name (see views.VIEWS) to the GIF path to write.
+    Data, per-frame geometry and the right-hand graph are computed once
+    and shared by all requested views. cache is a FrameCache (or a
+    directory for one); panels whose inputs are unchanged are read back
+    from it instead of being redrawn.
+    """
+    settings = settings or RenderSettings()
+    if isinstance(cache, str):
+        cache = FrameCache(cache)
+    resolution = mesh_resolution(settings.dpi, settings.panel_size, settings.quality)
+    geo = GeometryPipeline(data, settings.barrel_height, resolution)
+    graph = GraphPanel(data, settings)
+    panels = {name: ViewPanel(get_view(name), geo, settings) for name in outputs}
+    frames = {name: [] for name in outputs}
+
+    for frame in range(len(data)):
+        right = _panel_frame(graph, "graph", frame, cache)
+        for name, panel in panels.items():
+            frames[name].append(np.hstack([_panel_frame(panel, name, frame, cache), right]))
+
+    for name, path in outputs.items():
+        with instrument.stage("render.encode_gif"):
+            save_gif(frames[name], path, settings.frame_ms)
+    return outputs
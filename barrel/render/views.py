@@ -0,0 +1,163 @@
+# ==========================================================
+# Pluggable left-hand views of the barrel animation
+# Author: Mahmud Tijani
+# ==========================================================
+
+import numpy as np
+from matplotlib.patches import Polygon, Rectangle
+
+
+class View:
+    """
+    Base class of a barrel view.
+
+    setup() is called once on a fresh axes, draw() once per frame.
+    Views read everything they need from the shared GeometryPipeline.
+    context() returns the sheet-wide values setup() depends on; together
+    with the row values it forms the frame-cache key. Views that draw
+    meshes set uses_mesh so the mesh resolution is part of that key.
+    """
+
+    name = ""
+    title = ""
+    projection = None
+    uses_mesh = False
+
+    def context(self, geo):
+        return ()
+
+    def setup(self, ax, geo):
+        pass
+
+    def draw(self, ax, geo, frame):
+        raise NotImplementedError
+
+
+# ==========================================================
+# 2D STANDING CYLINDER
+# ==========================================================
+class StandingView(View):
+    name = "standing"
+    title = "2D Standing Cylinder (Fuel Volume)"
+
+    def context(self, geo):
+        return (float(np.nanmax(geo.data.radius)),)
+
+    def setup(self, ax, geo):
+        R_max = np.nanmax(geo.data.radius)
+        H = geo.barrel_height
+        ax.set_aspect("equal")
+        ax.set_xlim(-R_max*1.3, R_max*1.3)
+        ax.set_ylim(0, H*1.1)
+        ax.set_title(self.title)
+        ax.set_axis_off()
+        self.outline = Rectangle((0, 0), 0, H, linewidth=2, edgecolor="gray", facecolor="none")
+        self.fuel = Rectangle((0, 0), 0, 0, linewidth=0, facecolor="pink", alpha=0.85)
+        ax.add_patch(self.outline)
+        ax.add_patch(self.fuel)
+
+    def draw(self, ax, geo, frame):
+        R = geo.radius(frame)
+        self.outline.set_xy((-R, 0))
+        self.outline.set_width(2*R)
+        self.fuel.set_xy((-R, 0))
+        self.fuel.set_width(2*R)
+        self.fuel.set_height(geo.fill_height(frame))
+
+
+# ==========================================================
+# SIDE VIEW WITH INCLINED FUEL SURFACE
+# ==========================================================
+class SideView(View):
+    name = "side"
+    title = "Barrel Side View - Inclined Fuel"
+
+    def context(self, geo):
+        return (float(np.nanmax(geo.data.radius)), len(geo.data))
+
+    def setup(self, ax, geo):
+        R = np.nanmax(geo.data.radius)
+        H = geo.barrel_height
+        ax.set_xlim(-R*1.2, R*1.2)
+        ax.set_ylim(0, H*1.2)
+        ax.set_aspect("equal")
+        ax.set_title(self.title, fontsize=12)
+        self.outline = Rectangle((-R, 0), 2*R, H, edgecolor="black", facecolor="none", linewidth=3)
+        ax.add_patch(self.outline)
+        self.fuel = Polygon([[0, 0]], facecolor="deeppink", alpha=0.7, edgecolor="red", linewidth=2)
+        ax.add_patch(self.fuel)
+        self.info = ax.text(-R*1.05, H*1.1, "", fontsize=11, ha="left", va="top",
+                            bbox=dict(facecolor="white", alpha=0.9, edgecolor="gray"))
+
+    def draw(self, ax, geo, frame):
+        data = geo.data
+        R = geo.radius(frame)
+        y_left, y_right = geo.wall_heights(frame)
+
+        self.outline.set_xy((-R, 0))
+        self.outline.set_width(2*R)
+        self.fuel.set_xy(np.array([[-R, 0], [R, 0], [R, y_right], [-R, y_left]]))
+        self.info.set_text(
+            f"Frame: {frame+1}/{len(data)}\n"
+            f"α = {data.alpha[frame]:.2f}°\n"
+            f"Volume = {data.volume[frame]:,.0f} cm³\n"
+            f"k_eff = {data.k_eff[frame]:.5f}\n"
+            f"m = {data.m[frame]:.4f}\n"
+            f"b = {data.b[frame]:.3f} cm\n"
+            f"Left height: {y_left:.1f} cm | Right: {y_right:.1f} cm"
+        )
+
+
+# ==========================================================
+# 3D ISOMETRIC BARREL (standing fuel column)
+# ==========================================================
+class IsometricView(View):
+    name = "isometric"
+    title = "Inclined 3D Barrel (Isometric View)"
+    projection = "3d"
+    uses_mesh = True
+    elev, azim = 20, 40
+    fuel_color = "pink"
+
+    def reset(self, ax):
+        ax.cla()
+        ax.set_title(self.title)
+        ax.set_box_aspect((1, 1, 2))
+        ax.set_axis_off()
+
+    def setup(self, ax, geo):
+        self.reset(ax)
+
+    def draw(self, ax, geo, frame):
+        self.reset(ax)
+        ax.plot_surface(*geo.barrel_mesh(frame), color="lightgrey", alpha=0.25, linewidth=0)
+        ax.plot_surface(*geo.fuel_column_mesh(frame), color=self.fuel_color, alpha=0.85, linewidth=0)
+        ax.view_init(elev=self.elev, azim=self.azim)
+
+
+# ==========================================================
+# 3D BARREL WITH PLANE-DEFINED FUEL
+# ==========================================================
+class PlaneFuelView(IsometricView):
+    name = "plane"
+    title = "Inclined Barrel with Plane-Defined Spent Fuel"
+    elev, azim = 22, 35
+
+    def draw(self, ax, geo, frame):
+        self.reset(ax)
+        ax.plot_surface(*geo.barrel_mesh(frame), color="gray", alpha=0.25, linewidth=0, shade=True)
+        ax.plot_surface(*geo.plane_fuel_mesh(frame), color="pink", alpha=0.9, linewidth=0, shade=True)
+        ax.view_init(elev=self.elev, azim=self.azim)
+
+
+# ==========================================================
+# REGISTRY
+# ==========================================================
+VIEWS = {view.name: view for view in (StandingView, SideView, IsometricView, PlaneFuelView)}
+
+
+def get_view(name):
+    try:
+        return VIEWS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown view '{name}', choose from {sorted(VIEWS)}") from None
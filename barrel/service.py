@@ -0,0 +1,326 @@
+# ==========================================================
+# Local HTTP/JSON service for volume and level queries
+#   python -m barrel.service --port 8080 --workers 4
+#
+#   POST /volume  {"b": 12.79, "R": 37.5, "H": 100, "alpha": 50}
+#   POST /level   {"V": 58315.81, "alpha": 50}
+#   POST /level   {"queries": [{"V": 58315.81, "alpha": 50}, {"V": [1e4, 2e4], "m": 1.0}]}
+#   GET  /health
+# Author: Mahmud Tijani
+#
+# Any field may be a number or a list (broadcast together); R and H
+# default to the standard barrel, the tilt is alpha (deg) or m.
+# Concurrent requests are coalesced: the first query of an operation
+# opens a short window (--window-ms) and everything arriving before it
+# closes, or until --max-batch elements, is solved in one vectorized call
+# on a process pool, so the event loop only parses and routes.
+# Standard library + numpy only.
+# ==========================================================
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from . import geometry
+
+DEFAULT_R = 37.5
+DEFAULT_H = 100.0
+WINDOW_MS = 2.0
+MAX_BATCH = 65536
+MAX_BODY = 16 * 1024 * 1024
+
+# operation -> (input field, output field, accepted input spellings)
+OPERATIONS = {
+    "volume": ("b", "V", ("b", "level")),
+    "level": ("V", "b", ("V", "volume")),
+}
+
+
+class QueryError(ValueError):
+    """A query the service cannot answer (reported as HTTP 400)."""
+
+
+def evaluate(operation, x, R, H, m):
+    """Worker entry point: one vectorized solve over a coalesced batch."""
+    if operation == "volume":
+        return geometry.exact_volume(x, R, H, m)
+    return geometry.solve_level(x, R, H, m)
+
+
+# ==========================================================
+# Query parsing
+# ==========================================================
+def parse_query(operation, query, max_size=MAX_BATCH):
+    """
+    Returns (shape, x, R, H, m) as flat float arrays of equal length;
+    queries broadcasting to more than max_size elements are refused.
+    """
+    if not isinstance(query, dict):
+        raise QueryError("a query must be a JSON object")
+    _, _, names = OPERATIONS[operation]
+    name = next((n for n in names if n in query), None)
+    if name is None:
+        raise QueryError(f"missing '{names[0]}'")
+    try:
+        x = np.asarray(query[name], dtype=float)
+        R = np.asarray(query.get("R", DEFAULT_R), dtype=float)
+        H = np.asarray(query.get("H", DEFAULT_H), dtype=float)
+        if "m" in query:
+            m = np.asarray(query["m"], dtype=float)
+        else:
+            m = np.tan(np.deg2rad(np.asarray(query.get("alpha", 0.0), dtype=float)))
+        size = math.prod(np.broadcast_shapes(x.shape, R.shape, H.shape, m.shape))
+    except (TypeError, ValueError) as exc:
+        raise QueryError(str(exc)) from None
+    # Checked before broadcasting: small nested lists can span a huge grid
+    if size > max_size:
+        raise QueryError(f"query has {size} elements, more than {max_size}")
+    x, R, H, m = np.broadcast_arrays(x, R, H, m)
+    if not all(np.isfinite(a).all() for a in (x, R, H, m)):
+        raise QueryError("values must be finite numbers")
+    if np.any(R <= 0) or np.any(H <= 0):
+        raise QueryError("R and H must be positive")
+    return x.shape, x.ravel(), R.ravel(), H.ravel(), m.ravel()
+
+
+# ==========================================================
+# Request coalescing
+# ==========================================================
+class Batcher:
+    """Collects queries of one operation and solves them in batches."""
+
+    def __init__(self, operation, executor, window=WINDOW_MS / 1000, max_batch=MAX_BATCH):
+        self.operation = operation
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = []       # (future, x, R, H, m)
+        self.size = 0
+        self.timer = None
+        self.tasks = set()      # running batches (the loop only keeps weak references)
+        self.batches = 0
+        self.elements = 0
+
+    def submit(self, x, R, H, m):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((future, x, R, H, m))
+        self.size += x.size
+        if self.size >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        pending, self.pending, self.size = self.pending, [], 0
+        task = asyncio.ensure_future(self._run(pending))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def cancel(self):
+        """Cancels the running batches; their callers see CancelledError."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        for task in list(self.tasks):
+            task.cancel()
+
+    async def _run(self, pending):
+        columns = [np.concatenate([item[i] for item in pending]) for i in range(1, 5)]
+        self.batches += 1
+        self.elements += columns[0].size
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.executor, evaluate, self.operation, *columns)
+        except asyncio.CancelledError:
+            for future, *_ in pending:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future, *_ in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        start = 0
+        for future, x, *_ in pending:
+            if not future.done():
+                future.set_result(result[start:start + x.size])
+            start += x.size
+
+
+# ==========================================================
+# HTTP
+# ==========================================================
+class Service:
+    def __init__(self, workers=None, window_ms=WINDOW_MS, max_batch=MAX_BATCH):
+        self.executor = ProcessPoolExecutor(workers) if workers != 0 else None
+        self.batchers = {op: Batcher(op, self.executor, window_ms / 1000, max_batch)
+                         for op in OPERATIONS}
+        self.requests = 0
+        self.started = time.time()
+
+    async def answer(self, operation, body):
+        single = "queries" not in body
+        queries = [body] if single else body["queries"]
+        if not isinstance(queries, list):
+            raise QueryError("'queries' must be a list")
+        batcher = self.batchers[operation]
+        parsed = [parse_query(operation, q, batcher.max_batch) for q in queries]
+        values = await asyncio.gather(*(batcher.submit(*p[1:]) for p in parsed))
+
+        out_field = OPERATIONS[operation][1]
+        results = []
+        for (shape, *_), value in zip(parsed, values):
+            value = value.reshape(shape)
+            results.append({out_field: value.tolist() if shape else float(value)})
+        return results[0] if single else {"results": results}
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "batches": {op: {"batches": b.batches, "elements": b.elements}
+                        for op, b in self.batchers.items()},
+        }
+
+    async def route(self, method, path, body):
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, self.health()
+        operation = path.strip("/")
+        if operation not in OPERATIONS:
+            return HTTPStatus.NOT_FOUND, {"error": f"no route {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"null")
+            if not isinstance(payload, dict):
+                raise QueryError("body must be a JSON object")
+            return HTTPStatus.OK, await self.answer(operation, payload)
+        except (QueryError, json.JSONDecodeError) as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+        except Exception as exc:
+            # Solver or worker pool failure: answer instead of dropping the connection
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body cannot be framed: answer and close
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "invalid Content-Length"}
+                    body = None
+                elif length > MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}
+                    body = None
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    self.requests += 1
+                    status, payload = await self.route(method, path.split("?")[0], body)
+
+                try:
+                    data = json.dumps(payload, allow_nan=False).encode()
+                except ValueError:
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    data = json.dumps({"error": "non-finite result"}).encode()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1" and body is not None)
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        for batcher in self.batchers.values():
+            batcher.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(host="127.0.0.1", port=8080, workers=None, window_ms=WINDOW_MS,
+                max_batch=MAX_BATCH, ready=None):
+    service = Service(workers, window_ms, max_batch)
+    server = await asyncio.start_server(service.handle, host, port)
+    try:
+        # SIGTERM shuts the worker pool down instead of orphaning it
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, AttributeError):
+        pass
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.service",
+                                     description="HTTP/JSON service for volume and level queries.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="solver processes (0 solves on the default thread pool)")
+    parser.add_argument("--window-ms", type=float, default=WINDOW_MS,
+                        help="coalescing window of a batch")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH,
+                        help="elements that close a batch before the window ends")
+    args = parser.parse_args(argv)
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving on http://{host}:{port}", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.window_ms,
+                          args.max_batch, ready))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
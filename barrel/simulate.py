@@ -0,0 +1,176 @@
+# ==========================================================
+# Draining / filling time simulation for batches of barrels
+#   python -m barrel.simulate drain --V0 200000 --alpha 5 --outlet-area 3
+#   python -m barrel.simulate fill --V0 0 --inflow 150 --alpha 5 --record-dt 60
+# Author: Mahmud Tijani
+#
+#     sim = Simulation(R=37.5, H=100.0, alpha=[0.1, 5, 20], outlet_area=3.0)
+#     res = sim.run(V0=200000.0, t_end=7200.0, dt=1.0, record_dt=60.0)
+#     res["finish"]                  # s until empty / full per barrel
+#
+# Net flow per barrel:
+#     dV/dt = inflow - Cd * A_o * sqrt(2 g head)
+# with the outlet at the bottom of the section at axial position x_o,
+# so the head (vertical height of the surface above it) is
+#     head = (b - m*x_o + R) * cos(alpha).
+# All barrels advance in lockstep with classic RK4 on V; every stage needs
+# b(V), which is one geometry.solve_level call warm-started at
+#     b + (V_stage - V) / (dV/db)
+# so Newton converges in one or two steps (no brentq/quad). A barrel is
+# finished when it drains to the outlet (head 0, no inflow) or fills up;
+# its finish time is interpolated inside the last step, and it leaves
+# the active set. Records are kept every record_dt only, in arrays
+# allocated up front (records x barrels), so memory is bounded; iterate()
+# yields the records instead of storing them.
+# ==========================================================
+
+import argparse
+import math
+import sys
+
+import numpy as np
+
+from . import geometry
+
+G = 981.0          # cm/s^2
+CD = 0.61          # discharge coefficient of a sharp-edged orifice
+
+
+class Simulation:
+    """
+    Barrels (R, H, tilt alpha in deg) with an inflow (cm^3/s) and a bottom
+    outlet of area outlet_area (cm^2) at axial position outlet_x (default:
+    the low end). All parameters broadcast over the barrels.
+    """
+
+    def __init__(self, R=37.5, H=100.0, alpha=0.1, inflow=0.0, outlet_area=0.0, Cd=CD,
+                 outlet_x=None):
+        m = np.tan(np.deg2rad(alpha))
+        # Fuel (y <= b - m*x) is deepest at x = 0 for m > 0, at x = H for m < 0
+        low_end = np.where(np.asarray(m) > 0, 0.0, H)
+        x_o = low_end if outlet_x is None else outlet_x
+        arrays = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in
+                                       (R, H, m, inflow, outlet_area, Cd, x_o)))
+        self.R, self.H, self.m, self.inflow, self.outlet_area, self.Cd, self.outlet_x = (
+            np.array(a).ravel() for a in arrays)
+        self.n = len(self.R)
+        self.cos = 1.0 / np.sqrt(1.0 + self.m**2)
+        self.V_full = geometry.full_volume(self.R, self.H)
+        # Volume left when the surface reaches the outlet
+        self.V_stop = geometry.exact_volume(-self.R + self.m * self.outlet_x, self.R, self.H, self.m)
+        if outlet_x is None and np.any(self.V_stop > 1e-12 * self.V_full):
+            raise RuntimeError("Outlet at the low end must drain the barrel completely")
+
+    def rate(self, b, idx):
+        """dV/dt at levels b of the barrels idx."""
+        head = np.maximum((b - self.m[idx] * self.outlet_x[idx] + self.R[idx]) * self.cos[idx], 0.0)
+        return self.inflow[idx] - self.Cd[idx] * self.outlet_area[idx] * np.sqrt(2.0 * G * head)
+
+    def _level(self, V, b, S, V_ref, idx):
+        """b(V) warm-started from the level b (slope S) at volume V_ref."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            guess = np.where(S > 0, b + (V - V_ref) / S, b)
+        R, H, m = self.R[idx], self.H[idx], self.m[idx]
+        b = geometry.solve_level(np.clip(V, 0.0, self.V_full[idx]), R, H, m, b0=guess)
+        return np.clip(b, *geometry.level_bounds(R, H, m))
+
+    def iterate(self, V0, t_end, dt=1.0, record_dt=None):
+        """
+        Yields (t, V, b, finish) every record_dt seconds (every step if
+        None); V and b cover all barrels, finish is NaN while running.
+        The arrays are reused between records: copy them to keep them.
+        """
+        V = np.array(np.broadcast_to(np.asarray(V0, dtype=float), (self.n,)))
+        V = np.clip(V, 0.0, self.V_full)
+        b = geometry.solve_level(V, self.R, self.H, self.m)
+        b = np.clip(b, *geometry.level_bounds(self.R, self.H, self.m))
+        finish = np.full(self.n, np.nan)
+        every = max(1, round((record_dt or dt) / dt))
+        steps = math.ceil(t_end / dt)
+
+        idx = np.arange(self.n)
+        idx = self._finished(idx, V, V, 0.0, dt, finish)
+        yield 0.0, V, b, finish
+        for step in range(1, steps + 1):
+            if idx.size:
+                Vi, bi = V[idx], b[idx]
+                S = geometry.volume_slope(bi, self.R[idx], self.H[idx], self.m[idx])
+                k1 = self.rate(bi, idx)
+                V2 = Vi + 0.5 * dt * k1
+                k2 = self.rate(self._level(V2, bi, S, Vi, idx), idx)
+                V3 = Vi + 0.5 * dt * k2
+                k3 = self.rate(self._level(V3, bi, S, Vi, idx), idx)
+                V4 = Vi + dt * k3
+                k4 = self.rate(self._level(V4, bi, S, Vi, idx), idx)
+                V_new = Vi + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+                active = self._finished(idx, Vi, V_new, (step - 1) * dt, dt, finish)
+                V_new = np.clip(V_new, np.where(self.inflow[idx] > 0, 0.0, self.V_stop[idx]),
+                                self.V_full[idx])
+                V[idx] = V_new
+                b[idx] = self._level(V_new, bi, S, Vi, idx)
+                idx = active
+            if step % every == 0 or step == steps:
+                yield step * dt, V, b, finish
+            if idx.size == 0 and step % every == 0:
+                break
+
+    def _finished(self, idx, V_old, V_new, t, dt, finish):
+        """Marks barrels that emptied or filled during the step; returns the still active ones."""
+        empty = (V_new <= self.V_stop[idx] * (1.0 + 1e-12)) & (self.inflow[idx] <= 0)
+        full = V_new >= self.V_full[idx] * (1.0 - 1e-12)
+        target = np.where(full, self.V_full[idx], self.V_stop[idx])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.clip(np.nan_to_num((target - V_old) / (V_new - V_old), nan=0.0), 0.0, 1.0)
+        done = empty | full
+        finish[idx[done]] = t + frac[done] * dt
+        return idx[~done]
+
+    def run(self, V0, t_end, dt=1.0, record_dt=None):
+        """iterate() collected into arrays: t (records), V and b (records x barrels), finish."""
+        every = max(1, round((record_dt or dt) / dt))
+        n_records = math.ceil(t_end / dt) // every + 2
+        t = np.empty(n_records)
+        V = np.empty((n_records, self.n))
+        b = np.empty((n_records, self.n))
+        k = 0
+        for k, (t_k, V_k, b_k, finish) in enumerate(self.iterate(V0, t_end, dt, record_dt)):
+            t[k], V[k], b[k] = t_k, V_k, b_k
+        return {"t": t[:k + 1], "V": V[:k + 1], "b": b[:k + 1], "finish": finish.copy()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.simulate",
+                                     description="Drain or fill time of tilted barrels.")
+    parser.add_argument("mode", choices=("drain", "fill"))
+    parser.add_argument("--V0", type=float, nargs="+", required=True, help="initial volumes (cm^3)")
+    parser.add_argument("--alpha", type=float, nargs="+", default=[0.1], help="tilts (deg)")
+    parser.add_argument("--R", type=float, default=37.5)
+    parser.add_argument("--H", type=float, default=100.0)
+    parser.add_argument("--outlet-area", type=float, default=3.0, help="cm^2 (drain)")
+    parser.add_argument("--inflow", type=float, default=100.0, help="cm^3/s (fill)")
+    parser.add_argument("--dt", type=float, default=1.0)
+    parser.add_argument("--t-end", type=float, default=24 * 3600.0)
+    parser.add_argument("--record-dt", type=float, help="print the state every record-dt seconds")
+    args = parser.parse_args(argv)
+
+    V0, alpha = np.broadcast_arrays(np.array(args.V0), np.array(args.alpha))
+    if args.mode == "drain":
+        sim = Simulation(args.R, args.H, alpha, outlet_area=args.outlet_area)
+    else:
+        sim = Simulation(args.R, args.H, alpha, inflow=args.inflow)
+
+    finish = None
+    for t, V, b, finish in sim.iterate(V0, args.t_end, args.dt, args.record_dt):
+        if args.record_dt:
+            print(f"t = {t:9.1f} s  V = " + " ".join(f"{v:12.2f}" for v in V))
+    print(f"{'alpha':>7} | {'V0 (cm^3)':>12} | {'V end (cm^3)':>12} | {'time (s)':>10}")
+    print("-" * 52)
+    for a, v0, v1, t_f in zip(alpha, V0, V, finish):
+        print(f"{a:7.2f} | {v0:12.2f} | {v1:12.2f} | "
+              + (f"{t_f:10.1f}" if np.isfinite(t_f) else f"{'> ' + format(args.t_end, 'g'):>10}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# ==========================================================
+# Append-only results store for sweep outputs
+#   python -m barrel.store results/ --R 37.5 --alpha 10 50      # query -> CSV
+# Author: Mahmud Tijani
+#
+#     store = ResultsStore("results")
+#     store.append(R=37.5, H=100.0, alpha=alpha_list, V_target=V, b=b,
+#                  V_check=V_check, surface=S, backend="closed_form",
+#                  error=err, seconds=t)
+#     rows = store.query(R=37.5, alpha=(10, 50))   # dict of arrays
+#
+# Layout: one partition directory per (R, H), e.g. "R=37.5,H=100";
+# every append writes one chunk per partition, rows sorted by alpha,
+# as raw little-endian column files (read back through np.memmap) or,
+# with format="parquet", as one Parquet file (pyarrow, imported lazily).
+# catalog.json is the index: per chunk its (R, H), alpha range, row count
+# and file, so a query opens only the chunks whose ranges match, and
+# inside a chunk reads only the alpha slice (binary search on the sorted
+# memmap, or row-group statistics for Parquet).
+# ==========================================================
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Column -> dtype (backend is stored as a code into catalog["backends"])
+COLUMNS = {
+    "R": "<f8",
+    "H": "<f8",
+    "alpha": "<f8",
+    "V_target": "<f8",
+    "b": "<f8",
+    "V_check": "<f8",
+    "surface": "<f8",
+    "backend": "<u2",
+    "error": "<f8",
+    "seconds": "<f8",
+    "created": "<f8",
+}
+CATALOG = "catalog.json"
+ROW_GROUP = 65536     # Parquet row group; its alpha statistics prune reads
+
+
+def partition_name(R, H):
+    return f"R={R:g},H={H:g}"
+
+
+class ResultsStore:
+    def __init__(self, root, format=None):
+        """format: "npy" or "parquet"; None opens an existing store as it is (npy if new)."""
+        if format not in (None, "npy", "parquet"):
+            raise ValueError(f"Unknown format '{format}'")
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        path = os.path.join(root, CATALOG)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.catalog = json.load(f)
+            if format is not None and format != self.catalog["format"]:
+                raise ValueError(f"Store '{root}' is in {self.catalog['format']} format, "
+                                 f"not {format}")
+        else:
+            self.catalog = {"format": format or "npy", "backends": [], "chunks": []}
+        self.format = self.catalog["format"]
+
+    def __len__(self):
+        return sum(chunk["rows"] for chunk in self.catalog["chunks"])
+
+    def _save_catalog(self):
+        path = os.path.join(self.root, CATALOG)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.catalog, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def _backend_code(self, name):
+        backends = self.catalog["backends"]
+        if name not in backends:
+            backends.append(name)
+        return backends.index(name)
+
+    # ------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------
+    def append(self, R, H, alpha, V_target, b, V_check, surface=np.nan, backend="",
+               error=np.nan, seconds=np.nan):
+        """Appends rows (all arguments broadcast together); returns the row count."""
+        values = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in
+                                       (R, H, alpha, V_target, b, V_check, surface, error, seconds)))
+        R, H, alpha, V_target, b, V_check, surface, error, seconds = (v.ravel() for v in values)
+        columns = {
+            "R": R, "H": H, "alpha": alpha, "V_target": V_target, "b": b, "V_check": V_check,
+            "surface": surface, "error": error, "seconds": seconds,
+            "backend": np.full(len(R), self._backend_code(backend)),
+            "created": np.full(len(R), time.time()),
+        }
+
+        keys = np.stack([R, H], axis=1)
+        for R_p, H_p in np.unique(keys, axis=0).tolist():
+            rows = np.flatnonzero((R == R_p) & (H == H_p))
+            rows = rows[np.argsort(alpha[rows], kind="stable")]
+            self._write_chunk(R_p, H_p, {name: col[rows] for name, col in columns.items()})
+        self._save_catalog()
+        return len(R)
+
+    def _write_chunk(self, R, H, columns):
+        partition = partition_name(R, H)
+        os.makedirs(os.path.join(self.root, partition), exist_ok=True)
+        chunk = {
+            "partition": partition, "R": R, "H": H, "rows": len(columns["R"]),
+            "alpha_min": float(columns["alpha"][0]), "alpha_max": float(columns["alpha"][-1]),
+        }
+        number = sum(c["partition"] == partition for c in self.catalog["chunks"])
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            chunk["file"] = f"{partition}/part-{number:05d}.parquet"
+            table = pa.table({name: np.asarray(col, dtype=COLUMNS[name])
+                              for name, col in columns.items()})
+            pq.write_table(table, os.path.join(self.root, chunk["file"]), row_group_size=ROW_GROUP)
+        else:
+            # Column files grow by appending; a chunk is a row range of them.
+            # Bytes past the catalogued rows are left by an append that died
+            # before saving the catalog: cut them so the offsets stay aligned.
+            chunk["file"] = partition
+            chunk["offset"] = sum(c["rows"] for c in self.catalog["chunks"]
+                                  if c["partition"] == partition)
+            for name, dtype in COLUMNS.items():
+                path = os.path.join(self.root, partition, f"{name}.bin")
+                size = chunk["offset"] * np.dtype(dtype).itemsize
+                with open(path, "ab") as f:
+                    if f.tell() < size:
+                        raise ValueError(f"{path} holds fewer rows than the catalog lists")
+                    f.truncate(size)
+                    f.write(np.asarray(columns[name], dtype=dtype).tobytes())
+        self.catalog["chunks"].append(chunk)
+
+    # ------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------
+    def _read_chunk(self, chunk, names, lo=None, hi=None):
+        """Columns of a chunk, limited to lo <= alpha <= hi (rows are alpha-sorted)."""
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            wanted = list(dict.fromkeys(names + ["alpha"]))
+            filters = [f for f in (("alpha", ">=", lo), ("alpha", "<=", hi)) if f[2] is not None]
+            table = pq.read_table(os.path.join(self.root, chunk["file"]), columns=wanted,
+                                  filters=filters or None)
+            data = {name: table.column(name).to_numpy() for name in wanted}
+        else:
+            data = {}
+            for name in set(names) | {"alpha"}:
+                path = os.path.join(self.root, chunk["file"], f"{name}.bin")
+                data[name] = np.memmap(path, dtype=COLUMNS[name], mode="r")[
+                    chunk["offset"]:chunk["offset"] + chunk["rows"]]
+        alpha = data["alpha"]
+        i0 = 0 if lo is None else np.searchsorted(alpha, lo, side="left")
+        i1 = len(alpha) if hi is None else np.searchsorted(alpha, hi, side="right")
+        return {name: np.array(data[name][i0:i1]) for name in names}
+
+    def query(self, R=None, H=None, alpha=None, backend=None, columns=None, tol=1e-9):
+        """
+        Rows matching R and H (values), alpha (value or (lo, hi) range,
+        inclusive) and backend (name). Returns a dict of column arrays.
+        """
+        names = list(columns or COLUMNS)
+        needed = list(dict.fromkeys(names + ["backend"]))
+        if alpha is None:
+            lo = hi = None
+        elif np.ndim(alpha) == 0:
+            lo, hi = alpha - tol, alpha + tol
+        else:
+            lo, hi = alpha[0] - tol, alpha[1] + tol
+
+        parts = []
+        for chunk in self.catalog["chunks"]:
+            if R is not None and abs(chunk["R"] - R) > tol:
+                continue
+            if H is not None and abs(chunk["H"] - H) > tol:
+                continue
+            if lo is not None and (chunk["alpha_max"] < lo or chunk["alpha_min"] > hi):
+                continue
+            data = self._read_chunk(chunk, needed, lo, hi)
+            if backend is not None:
+                backends = self.catalog["backends"]
+                keep = data["backend"] == (backends.index(backend) if backend in backends else -1)
+                data = {name: values[keep] for name, values in data.items()}
+            parts.append(data)
+
+        out = {name: np.concatenate([p[name] for p in parts]) if parts
+               else np.empty(0, dtype=COLUMNS[name]) for name in names}
+        if "backend" in out:
+            out["backend"] = np.array(self.catalog["backends"] or [""], dtype=object)[out["backend"]]
+        return out
+
+    def to_frame(self, **query):
+        """query() as a pandas DataFrame."""
+        import pandas as pd
+        return pd.DataFrame(self.query(**query))
+
+
+# ==========================================================
+# Solving + recording in one step
+# ==========================================================
+def record_sweep(store, alpha, V_target, R, H):
+    """Solves levels with barrel.geometry and appends them with checks and timing."""
+    from . import geometry
+
+    alpha, V_target, R, H = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                                  for v in (alpha, V_target, R, H)))
+    m = np.tan(np.deg2rad(alpha))
+    t0 = time.perf_counter()
+    b = geometry.solve_level(V_target, R, H, m)
+    seconds = (time.perf_counter() - t0) / max(b.size, 1)
+    V_check = geometry.exact_volume(b, R, H, m)
+    surface = geometry.surface_area(b, R, H, m)
+    error = np.abs(V_check - V_target) / V_target
+    store.append(R, H, alpha, V_target, b, V_check, surface, "closed_form", error, seconds)
+    return b
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.store",
+                                     description="Query a results store and print CSV.")
+    parser.add_argument("root")
+    parser.add_argument("--R", type=float)
+    parser.add_argument("--H", type=float)
+    parser.add_argument("--alpha", type=float, nargs="+", metavar=("LO", "HI"),
+                        help="one alpha or an inclusive range")
+    parser.add_argument("--backend")
+    args = parser.parse_args(argv)
+
+    alpha = None if args.alpha is None else (args.alpha[0] if len(args.alpha) == 1
+                                             else tuple(args.alpha[:2]))
+    rows = ResultsStore(args.root).query(R=args.R, H=args.H, alpha=alpha, backend=args.backend)
+    print(",".join(rows))
+    for values in zip(*rows.values()):
+        print(",".join(str(v) for v in values))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# ==========================================================
+# Real-time gauge stream: level readings -> smoothed volume and flow
+# Author: Mahmud Tijani
+#
+#     registry = BarrelRegistry({"B1": (37.5, 100.0), "B2": (30.0, 90.0)})
+#     for est in GaugeStream(registry).run(readings):   # (id, t, level, tilt)
+#         print(est.barrel_id, est.volume, est.flow_rate)
+#
+# Every reading costs one O(1) lookup in the barrel's cached surrogate
+# table (surrogate.LevelTable, keyed by geometry and tilt snapped to
+# TILT_STEP) and a constant-size state update; state per barrel is a
+# fixed __slots__ record, so latency and memory do not grow with the
+# length of the stream. Smoothing is a time-aware exponential average:
+#     w = 1 - exp(-dt / tau),   S += w * (x - S)
+# applied to the volume and to the finite-difference flow rate.
+# ==========================================================
+
+import json
+import math
+from collections import namedtuple
+
+from . import surrogate
+
+TILT_STEP = 0.01       # deg; tilts are snapped to this grid for table reuse
+TAU = 5.0              # s, smoothing time constant
+
+GaugeReading = namedtuple("GaugeReading", "barrel_id timestamp level tilt")
+VolumeEstimate = namedtuple("VolumeEstimate",
+                            "barrel_id timestamp level volume smoothed_volume flow_rate")
+
+
+class BarrelRegistry:
+    """Barrel id -> (R, H) in cm."""
+
+    def __init__(self, barrels=None):
+        self.barrels = {}
+        for barrel_id, (R, H) in (barrels or {}).items():
+            self.register(barrel_id, R, H)
+
+    def __contains__(self, barrel_id):
+        return barrel_id in self.barrels
+
+    def __len__(self):
+        return len(self.barrels)
+
+    def register(self, barrel_id, R, H):
+        if R <= 0 or H <= 0:
+            raise ValueError(f"Barrel {barrel_id!r}: R and H must be positive")
+        self.barrels[barrel_id] = (float(R), float(H))
+
+    def geometry(self, barrel_id):
+        try:
+            return self.barrels[barrel_id]
+        except KeyError:
+            raise KeyError(f"Unknown barrel {barrel_id!r}") from None
+
+    @classmethod
+    def load(cls, path):
+        """Reads {"<id>": {"R": .., "H": ..}, ...} from a JSON file."""
+        with open(path) as f:
+            data = json.load(f)
+        return cls({key: (value["R"], value["H"]) for key, value in data.items()})
+
+
+class _BarrelState:
+    __slots__ = ("tilt", "table", "t", "volume", "smoothed", "flow")
+
+    def __init__(self):
+        self.tilt = None
+        self.table = None
+        self.t = None
+        self.volume = None
+        self.smoothed = None
+        self.flow = 0.0
+
+
+class GaugeStream:
+    """Incremental level -> volume conversion for many barrels."""
+
+    def __init__(self, registry, tau=TAU, tilt_step=TILT_STEP):
+        self.registry = registry
+        self.tau = tau
+        self.tilt_step = tilt_step
+        self.states = {}
+
+    def _table(self, state, barrel_id, tilt):
+        tilt = round(tilt / self.tilt_step) * self.tilt_step
+        if tilt != state.tilt:
+            R, H = self.registry.geometry(barrel_id)
+            state.table = surrogate.table(R, H, math.tan(math.radians(tilt)))
+            state.tilt = tilt
+        return state.table
+
+    def update(self, barrel_id, timestamp, level, tilt):
+        """Processes one reading and returns its VolumeEstimate."""
+        state = self.states.get(barrel_id)
+        if state is None:
+            self.registry.geometry(barrel_id)      # fail fast on unknown ids
+            state = self.states[barrel_id] = _BarrelState()
+
+        volume = self._table(state, barrel_id, tilt).volume_at(level)
+
+        if state.t is None:
+            state.smoothed = volume
+            state.t = timestamp
+        elif timestamp > state.t:
+            dt = timestamp - state.t
+            w = 1.0 - math.exp(-dt / self.tau) if self.tau > 0 else 1.0
+            previous = state.smoothed
+            state.smoothed += w * (volume - previous)
+            state.flow += w * ((state.smoothed - previous) / dt - state.flow)
+            state.t = timestamp
+        # (late or duplicate timestamps are converted but not smoothed)
+        state.volume = volume
+        return VolumeEstimate(barrel_id, timestamp, level, volume, state.smoothed, state.flow)
+
+    def forget(self, barrel_id):
+        """Drops the state of a barrel that left the stream."""
+        self.states.pop(barrel_id, None)
+
+    # ------------------------------------------------------
+    # Pipeline stages
+    # ------------------------------------------------------
+    def run(self, readings):
+        """Generator stage: (barrel_id, timestamp, level, tilt) -> VolumeEstimate."""
+        update = self.update
+        for barrel_id, timestamp, level, tilt in readings:
+            yield update(barrel_id, timestamp, level, tilt)
+
+    async def arun(self, readings):
+        """Async generator stage over an async iterable of readings."""
+        update = self.update
+        async for barrel_id, timestamp, level, tilt in readings:
+            yield update(barrel_id, timestamp, level, tilt)
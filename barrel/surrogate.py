@@ -0,0 +1,160 @@
+# ==========================================================
+# Tabulated surrogate of the volume <-> level relation
+# Author: Mahmud Tijani
+#
+# For one geometry (R, H, m) the exact V(b) and dV/db are tabulated once
+# on a grid clustered towards the empty and full ends,
+#     b(u) = b_min + (b_max - b_min) * (1 - cos(pi*u)) / 2,  u uniform,
+# where the segment area behaves like (h + R)^(3/2). Volumes are cubic
+# Hermite interpolations in u; levels locate the cell by binary search
+# and invert its cubic with a few Newton steps. Both are O(1) per element.
+# ==========================================================
+
+import math
+
+import numpy as np
+
+from . import geometry
+from .memo import LRUCache
+
+N_TABLE = 1025
+NEWTON_STEPS = 4
+
+
+def _basis(s):
+    s2, s3 = s * s, s * s * s
+    return 2*s3 - 3*s2 + 1, s3 - 2*s2 + s, -2*s3 + 3*s2, s3 - s2
+
+
+class LevelTable:
+    """Forward and inverse volume/level tables of one barrel geometry."""
+
+    def __init__(self, R, H, m, n=N_TABLE):
+        self.R, self.H, self.m = float(R), float(H), float(m)
+        b_min, b_max = (float(v) for v in geometry.level_bounds(R, H, m))
+        self._build(b_min, b_max, float(geometry.full_volume(R, H)),
+                    lambda b: geometry.exact_volume(b, R, H, m),
+                    lambda b: geometry.volume_slope(b, R, H, m), n)
+
+    def _build(self, b_min, b_max, V_full, volume, slope, n):
+        """Tabulates volume(b) and slope(b) = dV/db between b_min and b_max."""
+        self.b_min, self.b_max = b_min, b_max
+        self.span = b_max - b_min
+        self.V_full = V_full
+
+        self.n = n
+        self.du = 1.0 / (n - 1)
+        u = self.du * np.arange(n)
+        b = self._b_of_u(u)
+        self.V = volume(b)
+        # dV/du = dV/db * db/du
+        self.dVdu = slope(b) * 0.5 * np.pi * self.span * np.sin(np.pi * u)
+        self._lists = None
+
+    def _b_of_u(self, u):
+        return self.b_min + 0.5 * self.span * (1.0 - np.cos(np.pi * u))
+
+    def _u_of_b(self, b):
+        c = np.clip(1.0 - 2.0 * (b - self.b_min) / self.span, -1.0, 1.0)
+        return np.arccos(c) / np.pi
+
+    def _cell(self, k, s):
+        h00, h10, h01, h11 = _basis(s)
+        du = self.du
+        return (h00 * self.V[k] + h10 * du * self.dVdu[k]
+                + h01 * self.V[k + 1] + h11 * du * self.dVdu[k + 1])
+
+    def volume(self, b):
+        b = np.asarray(b, dtype=float)
+        t = self._u_of_b(b) / self.du
+        k = np.minimum(t.astype(np.intp), self.n - 2)
+        V = self._cell(k, t - k)
+        return np.where(b <= self.b_min, 0.0, np.where(b >= self.b_max, self.V_full, V))
+
+    def volume_at(self, b):
+        """volume() of one float in plain Python (no array overhead)."""
+        if b <= self.b_min:
+            return 0.0
+        if b >= self.b_max:
+            return self.V_full
+        if self._lists is None:
+            self._lists = self.V.tolist(), (self.du * self.dVdu).tolist()
+        V, d = self._lists
+        t = math.acos(max(-1.0, min(1.0, 1.0 - 2.0 * (b - self.b_min) / self.span))) / math.pi / self.du
+        k = min(int(t), self.n - 2)
+        h00, h10, h01, h11 = _basis(t - k)
+        return h00 * V[k] + h10 * d[k] + h01 * V[k + 1] + h11 * d[k + 1]
+
+    def level(self, V):
+        V = np.asarray(V, dtype=float)
+        k = np.clip(np.searchsorted(self.V, V) - 1, 0, self.n - 2)
+        V0, V1 = self.V[k], self.V[k + 1]
+        d0, d1 = self.du * self.dVdu[k], self.du * self.dVdu[k + 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.clip((V - V0) / (V1 - V0), 0.0, 1.0)
+            for _ in range(NEWTON_STEPS):
+                h00, h10, h01, h11 = _basis(s)
+                f = h00 * V0 + h10 * d0 + h01 * V1 + h11 * d1 - V
+                s2 = s * s
+                df = (6*s2 - 6*s) * (V0 - V1) + (3*s2 - 4*s + 1) * d0 + (3*s2 - 2*s) * d1
+                s = np.clip(np.where(df > 0, s - f / df, s), 0.0, 1.0)
+        b = self._b_of_u((k + s) * self.du)
+        b = np.where(V <= 0, self.b_min - 1, b)
+        return np.where(V >= self.V_full, self.b_max + 1, b)
+
+
+# ==========================================================
+# Grouped evaluation over many geometries
+# ==========================================================
+_tables = LRUCache(maxsize=256)
+
+
+def table(R, H, m, n=N_TABLE):
+    """Cached LevelTable of one geometry."""
+    key = (float(R), float(H), float(m), n)
+    return _tables.get(key, lambda: LevelTable(R, H, m, n))
+
+
+def group_geometries(R, H, m):
+    """
+    Distinct (R, H, m) rows and, for each element, the index of its group.
+    """
+    columns = [np.unique(np.ravel(column), return_inverse=True) for column in (R, H, m)]
+    if math.prod(len(values) for values, _ in columns) > np.iinfo(np.int64).max:
+        # The mixed-radix code would overflow: compare the rows themselves
+        rows = np.stack([np.ravel(R), np.ravel(H), np.ravel(m)], axis=1)
+        unique, inverse = np.unique(rows, axis=0, return_inverse=True)
+        return unique, inverse.ravel()
+    code = np.zeros(np.size(R), dtype=np.int64)
+    for values, index in columns:
+        code = code * len(values) + index.ravel()
+    codes, first, inverse = np.unique(code, return_index=True, return_inverse=True)
+    unique = np.stack([np.ravel(R)[first], np.ravel(H)[first], np.ravel(m)[first]], axis=1)
+    return unique, inverse.ravel()
+
+
+def _grouped(method, x, R, H, m):
+    x = np.asarray(x, dtype=float)
+    if np.ndim(R) == np.ndim(H) == np.ndim(m) == 0:
+        return getattr(table(R, H, m), method)(x)
+
+    x, R, H, m = np.broadcast_arrays(x, *(np.asarray(a, dtype=float) for a in (R, H, m)))
+    unique, inverse = group_geometries(R, H, m)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+    flat = x.ravel()
+    out = np.empty(x.size)
+    for g, (Rg, Hg, mg) in enumerate(unique):
+        rows = order[starts[g]:starts[g + 1]]
+        out[rows] = getattr(table(Rg, Hg, mg), method)(flat[rows])
+    return out.reshape(x.shape)
+
+
+def volume(b, R, H, m):
+    """Surrogate of geometry.exact_volume, one table per distinct geometry."""
+    return _grouped("volume", b, R, H, m)
+
+
+def level(V, R, H, m):
+    """Surrogate of geometry.solve_level, one table per distinct geometry."""
+    return _grouped("level", V, R, H, m)
@@ -0,0 +1,207 @@
+# ==========================================================
+# Compound tilt: pitch of the axis plus roll about it
+#   python -m barrel.tilt --b 12.8 --pitch -5 5 --roll -5 5 --steps 201
+# Author: Mahmud Tijani
+#
+#     V = volume(b, 37.5, 100.0, pitch, roll)            # circular barrel
+#     V = volume(b, ellipse(40, 30), 100.0, pitch[:, None], roll[None, :])
+#     b = level(V, section, H, pitch, roll)
+#
+# Barrel frame: axis x in [0, H], section coordinates (y, z), y the
+# level direction of the untilted barrel. Pitching the axis by p and
+# rolling the barrel about it by r puts the world vertical at
+#     n = (sin p, cos p * cos r, cos p * sin r),
+# so the fuel n.X <= c is, divided by cos p,
+#     eta <= b - m*x,   eta = y*cos r + z*sin r,   m = tan p.
+# b is the level along eta at x = 0; r = 0 is the one-angle model.
+# Per section:
+#   * circle: rotating (y, z) by r leaves the section unchanged, so the
+#     volume is geometry.exact_volume(b, R, H, m) -- roll drops out;
+#   * ellipse (semi-axes a, c): y = a*Y, z = c*Z maps it to the unit
+#     circle with eta = k*Y', k = hypot(a cos r, c sin r), hence
+#         V = a*c * exact_volume(b/k, 1, H, m/k);
+#   * any other profiles.Section: the rolled section (area below eta,
+#     by quadrature across y) is tabulated once per roll, cached, and
+#     evaluated as a prism (profiles.Tank); rolls are rounded to ROLL_STEP.
+# Everything broadcasts over b (or V), pitch and roll.
+# ==========================================================
+
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+from . import geometry
+from .memo import LRUCache
+from .profiles import N_TABLE, Section, Tank
+
+ROLL_STEP = 0.01          # deg; rolled tables are built on this grid
+N_ACROSS = 4096           # quadrature nodes across the section (rolled tables)
+N_ROLLED = 1025           # angle-grid size of a rolled table
+MIN_SIN_ROLL = 1e-6       # below this |sin r| the section is used unrolled
+
+_rolled = LRUCache(maxsize=256)
+
+
+def _angles(*args):
+    return np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in args))
+
+
+# ==========================================================
+# Angle conventions
+# ==========================================================
+def from_normal(nx, ny, nz):
+    """(pitch, roll) in degrees from the world vertical (nx, ny, nz) in barrel coordinates."""
+    nx, ny, nz = _angles(nx, ny, nz)
+    return np.rad2deg(np.arctan2(nx, np.hypot(ny, nz))), np.rad2deg(np.arctan2(nz, ny))
+
+
+def from_ground_slopes(along, across):
+    """
+    (pitch, roll) for a barrel lying on ground that slopes by `along`
+    degrees in the axis direction and `across` degrees sideways.
+    """
+    along, across = _angles(along, across)
+    return from_normal(np.tan(np.deg2rad(along)), 1.0, np.tan(np.deg2rad(across)))
+
+
+# ==========================================================
+# Rolled sections
+# ==========================================================
+def rolled(section, roll, n=N_ROLLED, n_across=N_ACROSS):
+    """
+    (Section, centre): the section seen along eta at roll r (deg). Its
+    own coordinate is eta - centre (rolling shifts asymmetric profiles).
+    """
+    r = math.radians(roll)
+    c, s = math.cos(r), abs(math.sin(r))
+    if s < MIN_SIN_ROLL:
+        if c > 0:
+            return section, 0.0
+        # upside down: A_r(eta) = total - A(-eta)
+        A = section.total - section.A[::-1]
+        return Section.from_tables(A, section.dA[::-1], section.a, section.name), 0.0
+
+    # Midpoint rule across y on the angle grid (square-root ends absorbed)
+    phi = (np.arange(n_across) + 0.5) * math.pi / n_across
+    y = -section.a * np.cos(phi)
+    dy = section.a * np.sin(phi) * math.pi / n_across
+    w = section.width(y)
+    lo = float(np.min(y * c - 0.5 * w * s))
+    hi = float(np.max(y * c + 0.5 * w * s))
+    a, centre = 0.5 * (hi - lo), 0.5 * (hi + lo)
+
+    theta = math.pi / (n - 1) * np.arange(n)
+    eta = centre - a * np.cos(theta)
+    A = np.empty(n)
+    dA = np.empty(n)
+    for i in range(0, n, 128):
+        # z-extent of the strip at y below eta: (eta - y*cos r)/sin r + w/2, within [0, w]
+        z = (eta[i:i + 128, None] - y * c) / s + 0.5 * w
+        A[i:i + 128] = np.clip(z, 0.0, w) @ dy
+        dA[i:i + 128] = ((z > 0) & (z < w)) @ dy / s
+    A[0], A[-1] = 0.0, section.total
+    return Section.from_tables(A, dA * a * np.sin(theta), a, f"{section.name}@{roll:g}"), centre
+
+
+def _rolled_tank(section, H, roll):
+    def build():
+        sec, centre = rolled(section, roll)
+        return section, Tank(sec, H), centre
+    key = (id(section), float(H), roll)
+    entry = _rolled.get(key, build)
+    if entry[0] is not section:       # id() reused by a new section
+        _rolled.clear()
+        entry = _rolled.get(key, build)
+    return entry[1], entry[2]
+
+
+def _by_roll(section, H, x, m, roll, method):
+    """Applies Tank.volume / Tank.level group-wise, one rolled tank per roll."""
+    rounded = np.round(roll / ROLL_STEP) * ROLL_STEP
+    unique, inverse = np.unique(rounded, return_inverse=True)
+    out = np.empty(x.shape)
+    for k, r in enumerate(unique.tolist()):
+        rows = inverse == k
+        tank, centre = _rolled_tank(section, H, r)
+        if method == "volume":
+            out[rows] = tank.volume(x[rows] - centre, m[rows], tabulated=False)
+        else:
+            out[rows] = tank.level(x[rows], m[rows], tabulated=False) + centre
+    return out
+
+
+# ==========================================================
+# Volume and level
+# ==========================================================
+def volume(b, section, H, pitch, roll=0.0):
+    """
+    Fuel volume for level b (along eta) under pitch and roll (deg).
+    section is a radius R (circle) or a profiles.Section.
+    """
+    b, pitch, roll = _angles(b, pitch, roll)
+    m = np.tan(np.deg2rad(pitch))
+    axes = getattr(section, "semi_axes", None)
+    if axes is None and not isinstance(section, Section):
+        return geometry.exact_volume(b, section, H, m)
+    if axes is not None:
+        a, c = axes
+        r = np.deg2rad(roll)
+        k = np.hypot(a * np.cos(r), c * np.sin(r))
+        return a * c * geometry.exact_volume(b / k, 1.0, H, m / k)
+    shape = b.shape
+    return _by_roll(section, float(H), b.ravel(), m.ravel(), roll.ravel(), "volume").reshape(shape)
+
+
+def level(V, section, H, pitch, roll=0.0):
+    """Level b (along eta) holding volume V under pitch and roll (deg)."""
+    V, pitch, roll = _angles(V, pitch, roll)
+    m = np.tan(np.deg2rad(pitch))
+    axes = getattr(section, "semi_axes", None)
+    if axes is None and not isinstance(section, Section):
+        return geometry.solve_level(V, section, H, m)
+    if axes is not None:
+        a, c = axes
+        r = np.deg2rad(roll)
+        k = np.hypot(a * np.cos(r), c * np.sin(r))
+        return k * geometry.solve_level(V / (a * c), 1.0, H, m / k)
+    shape = V.shape
+    return _by_roll(section, float(H), V.ravel(), m.ravel(), roll.ravel(), "level").reshape(shape)
+
+
+def envelope(b, section, H, pitch_range, roll_range, steps=101):
+    """Volumes on a steps x steps (pitch, roll) grid, with the grid axes."""
+    pitch = np.linspace(*pitch_range, steps)
+    roll = np.linspace(*roll_range, steps)
+    return pitch, roll, volume(b, section, H, pitch[:, None], roll[None, :])
+
+
+def main(argv=None):
+    from .profiles import ellipse
+    parser = argparse.ArgumentParser(prog="python -m barrel.tilt",
+                                     description="Volume envelope over pitch x roll.")
+    parser.add_argument("--b", type=float, required=True, help="level along eta (cm)")
+    parser.add_argument("--R", type=float, default=37.5, help="radius, or half height with --width")
+    parser.add_argument("--width", type=float, help="half width: elliptical section")
+    parser.add_argument("--H", type=float, default=100.0)
+    parser.add_argument("--pitch", type=float, nargs=2, default=(-5.0, 5.0), metavar=("LO", "HI"))
+    parser.add_argument("--roll", type=float, nargs=2, default=(-5.0, 5.0), metavar=("LO", "HI"))
+    parser.add_argument("--steps", type=int, default=101)
+    args = parser.parse_args(argv)
+
+    section = args.R if args.width is None else ellipse(args.R, args.width, n=N_TABLE)
+    t0 = time.perf_counter()
+    pitch, roll, V = envelope(args.b, section, args.H, args.pitch, args.roll, args.steps)
+    elapsed = time.perf_counter() - t0
+    i, j = np.unravel_index(np.argmin(V), V.shape)
+    k, l = np.unravel_index(np.argmax(V), V.shape)
+    print(f"{V.size} tilt pairs in {elapsed * 1e3:.1f} ms")
+    print(f"min V = {V[i, j]:.2f} cm^3 at pitch {pitch[i]:.3f}, roll {roll[j]:.3f}")
+    print(f"max V = {V[k, l]:.2f} cm^3 at pitch {pitch[k]:.3f}, roll {roll[l]:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# ==========================================================
+# Uncertainty propagation for measured tilt, level and radius
+#   python -m barrel.uncertainty volume --b 12.79 --sigma-b 0.1 --alpha 50 --sigma-alpha 0.2
+#   python -m barrel.uncertainty level --V 58315.81 --alpha 50 --sigma-alpha 0.2 --sigma-R 0.05
+# Author: Mahmud Tijani
+#
+# Inputs are normal: alpha (deg) from the inclinometer, the gauge level
+# b or the fuel volume V, and R within its manufacturing tolerance.
+# Draws are pushed through geometry.exact_volume / geometry.solve_level in
+# batches of BATCH (the inverse starts from the first-order prediction
+# of each draw, so Newton needs 2-3 steps). The summary carries mean,
+# std and percentiles next to the first-order estimate from the
+# closed-form sensitivities (geometry.volume_gradient), which need no
+# re-solving:
+#     var(V) ~ sum_i (dV/dx_i * sigma_i)^2
+# and, for the level at fixed V,  db/dx = -(dV/dx) / (dV/db).
+# ==========================================================
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from . import geometry
+
+BATCH = 1 << 18
+PERCENTILES = (2.5, 5.0, 25.0, 50.0, 75.0, 95.0, 97.5)
+
+
+def sensitivities(b, R, H, alpha):
+    """dV/db, dV/dalpha (per degree), dV/dR and dV/dH at the nominal point."""
+    m = np.tan(np.deg2rad(alpha))
+    grad = geometry.volume_gradient(b, R, H, m)
+    return {
+        "b": float(grad["b"]),
+        "alpha": float(grad["m"] * (1.0 + m * m) * np.pi / 180.0),
+        "R": float(grad["R"]),
+        "H": float(grad["H"]),
+    }
+
+
+def summarize(samples, nominal, linear_std, coefficients):
+    return {
+        "nominal": float(nominal),
+        "mean": float(samples.mean()),
+        "std": float(samples.std(ddof=1)),
+        "percentiles": dict(zip(map(str, PERCENTILES),
+                                np.percentile(samples, PERCENTILES).tolist())),
+        "linear_std": float(linear_std),
+        "sensitivities": coefficients,
+        "draws": int(samples.size),
+    }
+
+
+def _draws(rng, n, mean, sigma):
+    return mean + sigma * rng.standard_normal(n) if sigma else np.full(n, float(mean))
+
+
+def propagate_volume(b, alpha, R=37.5, H=100.0, sigma_b=0.0, sigma_alpha=0.0, sigma_R=0.0,
+                     n=1_000_000, seed=0, batch=BATCH, return_samples=False):
+    """Distribution of the fuel volume for uncertain level, tilt and radius."""
+    rng = np.random.default_rng(seed)
+    V = np.empty(n)
+    for start in range(0, n, batch):
+        k = min(batch, n - start)
+        b_i = _draws(rng, k, b, sigma_b)
+        m_i = np.tan(np.deg2rad(_draws(rng, k, alpha, sigma_alpha)))
+        R_i = _draws(rng, k, R, sigma_R)
+        V[start:start + k] = geometry.exact_volume(b_i, R_i, H, m_i)
+
+    coefficients = sensitivities(b, R, H, alpha)
+    linear_std = np.hypot(np.hypot(coefficients["b"] * sigma_b, coefficients["alpha"] * sigma_alpha),
+                          coefficients["R"] * sigma_R)
+    nominal = geometry.exact_volume(b, R, H, np.tan(np.deg2rad(alpha)))
+    summary = summarize(V, nominal, linear_std, coefficients)
+    return (summary, V) if return_samples else summary
+
+
+def propagate_level(V, alpha, R=37.5, H=100.0, sigma_V=0.0, sigma_alpha=0.0, sigma_R=0.0,
+                    n=1_000_000, seed=0, batch=BATCH, return_samples=False):
+    """Distribution of the level b solving a (possibly uncertain) volume."""
+    rng = np.random.default_rng(seed)
+    b0 = float(geometry.solve_level(V, R, H, np.tan(np.deg2rad(alpha))))
+    dV = sensitivities(b0, R, H, alpha)
+    coefficients = {"V": 1.0 / dV["b"], "alpha": -dV["alpha"] / dV["b"], "R": -dV["R"] / dV["b"]}
+
+    b = np.empty(n)
+    for start in range(0, n, batch):
+        k = min(batch, n - start)
+        V_i = _draws(rng, k, V, sigma_V)
+        alpha_i = _draws(rng, k, alpha, sigma_alpha)
+        R_i = _draws(rng, k, R, sigma_R)
+        # First-order prediction as the Newton starting point
+        guess = (b0 + coefficients["V"] * (V_i - V) + coefficients["alpha"] * (alpha_i - alpha)
+                 + coefficients["R"] * (R_i - R))
+        b[start:start + k] = geometry.solve_level(V_i, R_i, H, np.tan(np.deg2rad(alpha_i)), b0=guess)
+
+    linear_std = np.hypot(np.hypot(coefficients["V"] * sigma_V, coefficients["alpha"] * sigma_alpha),
+                          coefficients["R"] * sigma_R)
+    summary = summarize(b, b0, linear_std, coefficients)
+    return (summary, b) if return_samples else summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m barrel.uncertainty",
+                                     description="Monte Carlo + linear uncertainty of V or b.")
+    parser.add_argument("quantity", choices=("volume", "level"),
+                        help="volume from a measured level, or level for a given volume")
+    parser.add_argument("--b", type=float, help="measured level (cm), for 'volume'")
+    parser.add_argument("--V", type=float, help="fuel volume (cm^3), for 'level'")
+    parser.add_argument("--alpha", type=float, required=True, help="tilt (deg)")
+    parser.add_argument("--R", type=float, default=37.5)
+    parser.add_argument("--H", type=float, default=100.0)
+    parser.add_argument("--sigma-b", type=float, default=0.0)
+    parser.add_argument("--sigma-V", type=float, default=0.0)
+    parser.add_argument("--sigma-alpha", type=float, default=0.0, help="deg")
+    parser.add_argument("--sigma-R", type=float, default=0.0)
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    common = dict(alpha=args.alpha, R=args.R, H=args.H, sigma_alpha=args.sigma_alpha,
+                  sigma_R=args.sigma_R, n=args.draws, seed=args.seed)
+    if args.quantity == "volume":
+        if args.b is None:
+            parser.error("volume needs --b")
+        summary = propagate_volume(args.b, sigma_b=args.sigma_b, **common)
+    else:
+        if args.V is None:
+            parser.error("level needs --V")
+        summary = propagate_level(args.V, sigma_V=args.sigma_V, **common)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
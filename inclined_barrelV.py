@@ -1,6 +1,6 @@
 import numpy as np
-from scipy.integrate import quad
-from scipy.optimize import brentq
+
+from barrel.geometry import exact_volume, solve_level
 
 # ====================================================
 # Fixed geometry
@@ -16,57 +16,16 @@ V_list = [
     42565.81, 39415.81, 36265.81, 33115.81, 29965.81
 ]
 
-V_full = np.pi * R**2 * H
-
-
-# ====================================================
-# Circular segment area
-# ====================================================
-def segment_area(h, R):
-    h = np.clip(h, -R, R)
-    if h >= R:
-        return np.pi * R**2
-    elif h <= -R:
-        return 0.0
-    else:
-        return R**2 * np.arccos(-h / R) - h * np.sqrt(R**2 - h**2)
-
-
-# ====================================================
-# Exact inclined-cylinder volume
-# ====================================================
-def exact_volume(b, R, H, m):
-    if abs(m) < 1e-12:
-        return H * segment_area(b, R)
-    else:
-        h1 = b - m * H
-        h2 = b
-        V, _ = quad(lambda h: segment_area(h, R), h1, h2)
-        return V / m
-
 
 # ====================================================
-# Solve b for each volume
+# Solve b for every volume at once (barrel/geometry.py)
 # ====================================================
 print(f"alpha = {alpha_deg:.2f} deg")
 print(f"{'V_target (cm^3)':>18} | {'b (cm)':>12} | {'V_check (cm^3)':>16}")
 print("-" * 52)
 
-for V_target in V_list:
-
-    if V_target <= 0:
-        b_sol = -R - 1
-    elif V_target >= V_full:
-        b_sol = R + m * H + 1
-    else:
-        b_min = -R
-        b_max = R + m * H
-
-        def F(b):
-            return exact_volume(b, R, H, m) - V_target
-
-        b_sol = brentq(F, b_min, b_max)
-
-    V_check = exact_volume(b_sol, R, H, m)
+b_list = solve_level(V_list, R, H, m)
+V_check_list = exact_volume(b_list, R, H, m)
 
+for V_target, b_sol, V_check in zip(V_list, b_list, V_check_list):
     print(f"{V_target:18.1f} | {b_sol:12.6f} | {V_check:16.2f}")
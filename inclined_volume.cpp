@@ -14,7 +14,7 @@ double segment_area(double h, double R)
     if (h >= R) return M_PI * R * R;
     if (h <= -R) return 0.0;
 
-    return R * R * acos(-h / R) - h * sqrt(R * R - h * h);
+    return R * R * acos(-h / R) + h * sqrt(R * R - h * h);
 }
 
 // ====================================================